@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Compare HTML builds with node tables and with prebuilt HTML tables.
+
+Usage::
+
+    python benchmarks/bench_html_tables.py [--profile medium] [--inline --max-depth 3]
+
+A synthetic description is built to HTML twice, with ``swaggerdoc_html_tables``
+off and on, each time in a fresh interpreter. The time spent reading (parsing
+and rendering the documents) and writing, the size of the doctree pickle and
+the number of nodes are reported, and the pages must be identical.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_stages import PROFILES  # noqa: E402
+from generate_spec import generate_spec  # noqa: E402
+
+BUILD_SCRIPT = '''
+import json, os, pickle, sys, time
+from docutils import nodes
+from sphinx.application import Sphinx
+src, out, html_tables = sys.argv[1], sys.argv[2], sys.argv[3] == '1'
+marks = {}
+app = Sphinx(src, src, out, out + '/.doctrees', 'html', status=None, warning=sys.stderr, freshenv=True,
+             confoverrides={'swaggerdoc_html_tables': html_tables})
+def mark(name):
+    def handler(*args):
+        marks.setdefault(name, time.time())  # Returning a value would mean something to Sphinx
+    return handler
+app.connect('env-before-read-docs', mark('read'))
+app.connect('env-updated', mark('write'))
+app.build()
+end = time.time()
+with open(out + '/.doctrees/index.doctree', 'rb') as fd:
+    doctree = pickle.load(fd)
+findall = getattr(doctree, 'findall', doctree.traverse)
+print(json.dumps({'read': marks['write'] - marks['read'], 'write': end - marks['write'],
+                  'doctree_bytes': os.path.getsize(out + '/.doctrees/index.doctree'),
+                  'doctree_nodes': sum(1 for node in findall(nodes.Node))}))
+'''
+
+
+def measure(src, out, html_tables):
+    process = subprocess.run([sys.executable, '-c', BUILD_SCRIPT, src, out, '1' if html_tables else '0'],
+                             stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='medium')
+    parser.add_argument('--inline', action='store_true', help='Render in inline mode instead of reference mode')
+    parser.add_argument('--max-depth', type=int, default=0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='swaggerdoc-html-')
+    try:
+        src = os.path.join(workdir, 'src')
+        os.makedirs(src)
+        with open(os.path.join(src, 'spec.json'), 'w') as fd:
+            json.dump(generate_spec(**PROFILES[args.profile]), fd)
+        with open(os.path.join(src, 'conf.py'), 'w') as fd:
+            fd.write("extensions = ['sphinxcontrib.swaggerdoc']\n"
+                     "master_doc = 'index'\n"
+                     "swaggerdoc_validation = 'off'\n"
+                     "swaggerdoc_render_mode = {!r}\n"
+                     "swaggerdoc_max_depth = {}\n".format('inline' if args.inline else 'reference', args.max_depth))
+        with open(os.path.join(src, 'index.rst'), 'w') as fd:
+            fd.write('API\n===\n\n.. swaggerv2doc:: spec.json\n')
+
+        results = {}
+        pages = {}
+        for name, html_tables in (('nodes', False), ('html', True)):
+            out = os.path.join(workdir, name)
+            results[name] = measure(src, out, html_tables)
+            with open(os.path.join(out, 'index.html'), 'rb') as fd:
+                pages[name] = fd.read()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for name in ('nodes', 'html'):
+        value = results[name]
+        print('{:<6} read {:8.3f} s  write {:8.3f} s  doctree {:10d} bytes {:8d} nodes'.format(
+            name, value['read'], value['write'], value['doctree_bytes'], value['doctree_nodes']))
+    identical = pages['nodes'] == pages['html']
+    print('pages: {}'.format('identical' if identical else 'DIFFERENT'))
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
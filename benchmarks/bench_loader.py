@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Compare the spec loaders on real descriptions.
+
+Usage::
+
+    python benchmarks/bench_loader.py spec.yaml [spec.json ...] [-n REPEAT]
+
+Every available parser is timed on each file, including the previous
+``json.loads`` then pure Python ``yaml.load`` fallback and
+``sphinxcontrib.swaggerdoc.loader.load_spec``.
+"""
+import argparse
+import json
+import timeit
+
+import yaml
+
+from sphinxcontrib.swaggerdoc import loader
+
+
+def previous_loader(content):
+    try:
+        return json.loads(content)
+    except Exception:
+        return yaml.load(content, Loader=yaml.SafeLoader)
+
+
+def candidates(path):
+    yield 'json + pure yaml (previous)', previous_loader
+    yield 'load_spec ({}, {})'.format(loader._json.__name__, loader.yaml_loader().__name__), \
+        lambda content: loader.load_spec(content, name=path)
+    if loader.sniff_format(open(path, 'rb').read(), name=path) == 'yaml':
+        yield 'yaml SafeLoader', lambda content: yaml.load(content, Loader=yaml.SafeLoader)
+        if hasattr(yaml, 'CSafeLoader'):
+            yield 'yaml CSafeLoader', lambda content: yaml.load(content, Loader=yaml.CSafeLoader)
+    else:
+        yield 'json', json.loads
+        if loader._json is not json:
+            yield loader._json.__name__, loader._json.loads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('-n', '--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for path in args.paths:
+        with open(path, 'rb') as fd:
+            content = fd.read()
+
+        print('{} ({:.1f} MB)'.format(path, len(content) / 1024.0 / 1024.0))
+        for name, load in candidates(path):
+            best = min(timeit.repeat(lambda: load(content), number=1, repeat=args.repeat))
+            print('  {:<40} {:8.3f} s'.format(name, best))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Measure the speedup of rendering definitions and responses in a process pool.
+
+Usage::
+
+    python benchmarks/bench_render_workers.py [--profile large] [--definitions 3000] [--workers 1 2 4]
+    python benchmarks/bench_render_workers.py --inline --max-depth 3 --html
+
+The Definitions and Responses of a synthetic description are rendered, in
+reference mode unless ``--inline`` is given, with each number of workers (1
+being the serial path, as with ``swaggerdoc_render_workers = 0``). The output
+of every run must be identical to the serial one; the speedup and the
+efficiency per core are reported. The serial path is also timed with the
+garbage collector running, as it did before rendering paused it.
+
+``--html`` also builds the description to HTML serially and with the largest
+number of workers and compares the pages byte for byte.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from sphinxcontrib.swaggerdoc.fetch import SpecFetcher
+from sphinxcontrib.swaggerdoc.registry import SpecRegistry
+from sphinxcontrib.swaggerdoc.spec_cache import SpecCache
+from sphinxcontrib.swaggerdoc.swaggerv2_doc import SwaggerV2DocDirective, paused_gc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_stages import PROFILES, bare_directive  # noqa: E402
+from generate_spec import generate_spec  # noqa: E402
+
+
+class Config(object):
+    """The configuration values the loading of a description reads."""
+
+    swaggerdoc_validation = 'off'
+    swaggerdoc_validation_backend = None
+
+
+def render(specification, inline, max_depth, workers, collect=False):
+    directive = bare_directive(specification, {'max_depth': max_depth})
+    directive.inline = inline
+    directive.render_workers = workers
+    start = time.time()
+    if collect:
+        sections = [directive.make_entries(section, specification.get(section, {}))
+                    for section in ('responses', 'definitions')]
+    else:
+        with paused_gc():
+            sections = [directive.make_entries(section, specification.get(section, {}))
+                        for section in ('responses', 'definitions')]
+    return time.time() - start, [entry.pformat() for entries in sections for entry in entries]
+
+
+def build_html(workdir, spec_path, inline, max_depth, workers):
+    from sphinx.application import Sphinx
+
+    srcdir = os.path.join(workdir, 'src-{}'.format(workers))
+    os.makedirs(srcdir)
+    shutil.copy(spec_path, srcdir)
+    with open(os.path.join(srcdir, 'conf.py'), 'w') as fd:
+        fd.write("extensions = ['sphinxcontrib.swaggerdoc']\n"
+                 "master_doc = 'index'\n"
+                 "swaggerdoc_validation = 'off'\n"
+                 "swaggerdoc_render_mode = {!r}\n"
+                 "swaggerdoc_max_depth = {}\n"
+                 "swaggerdoc_render_workers = {}\n".format('inline' if inline else 'reference', max_depth, workers))
+    with open(os.path.join(srcdir, 'index.rst'), 'w') as fd:
+        fd.write('API\n===\n\n.. swaggerv2doc:: {}\n'.format(os.path.basename(spec_path)))
+
+    outdir = os.path.join(workdir, 'html-{}'.format(workers))
+    app = Sphinx(srcdir, srcdir, outdir, os.path.join(outdir, '.doctrees'), 'html', status=None, warning=None,
+                 freshenv=True)
+    app.build()
+    with open(os.path.join(outdir, 'index.html'), 'rb') as fd:
+        return fd.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='large')
+    parser.add_argument('--definitions', type=int, help='Number of definitions, defaults to the one of the profile')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--inline', action='store_true', help='Render in inline mode instead of reference mode')
+    parser.add_argument('--max-depth', type=int, default=0)
+    parser.add_argument('--html', action='store_true', help='Compare the HTML pages of serial and parallel builds')
+    args = parser.parse_args()
+
+    options = dict(PROFILES[args.profile])
+    if args.definitions is not None:
+        options['definitions'] = args.definitions
+
+    workdir = tempfile.mkdtemp(prefix='swaggerdoc-workers-')
+    try:
+        spec_path = os.path.join(workdir, 'spec.json')
+        with open(spec_path, 'w') as fd:
+            json.dump(generate_spec(**options), fd)
+        registry = SpecRegistry(Config(), SpecCache(os.path.join(workdir, 'cache'), 0),
+                                SpecFetcher(os.path.join(workdir, 'http')))
+        specification = SwaggerV2DocDirective.resolve_swagger(registry, spec_path)[0]
+        print('{} definitions, {} responses, {} CPUs'.format(
+            len(specification.get('definitions', {})), len(specification.get('responses', {})), os.cpu_count()))
+
+        seconds, output = render(specification, args.inline, args.max_depth, 1, collect=True)
+        print('serial, collector running {:8.3f} s'.format(seconds))
+
+        serial = None
+        failed = False
+        for workers in sorted(set([1] + args.workers)):
+            seconds, output = render(specification, args.inline, args.max_depth, workers)
+            if serial is None:
+                serial = seconds, output
+            identical = output == serial[1]
+            failed = failed or not identical
+            speedup = serial[0] / seconds
+            print('{:3d} workers {:8.3f} s  speedup {:5.2f}  per core {:5.2f}  {}'.format(
+                workers, seconds, speedup, speedup / workers, 'identical' if identical else 'DIFFERENT'))
+
+        if args.html:
+            workers = max(args.workers)
+            identical = (build_html(workdir, spec_path, args.inline, args.max_depth, 0) ==
+                         build_html(workdir, spec_path, args.inline, args.max_depth, workers))
+            failed = failed or not identical
+            print('HTML with {} workers: {}'.format(workers, 'identical' if identical else 'DIFFERENT'))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""Time each stage of the extension on a synthetic description.
+
+Usage::
+
+    python benchmarks/bench_stages.py [--profile medium] [--save baseline.json]
+    python benchmarks/bench_stages.py --compare benchmarks/baseline.json
+
+Stages are timed separately: loading, resolution, indexing (tag grouping),
+node construction and a full HTML build. Peak memory of every stage, the
+number of nodes and characters of text the directive renders, the doctree
+pickle size and the number of doctree nodes are recorded as well.
+Everything runs locally, no network access is needed.
+
+``--max-depth``, ``--max-properties`` and ``--max-nodes`` apply the
+rendering limits of the extension, to measure their effect.
+
+``--compare`` exits with status 1 when the directive renders more nodes or
+text than in the stored baseline. These only depend on the extension, unlike
+the doctree, which depends on the versions of Sphinx and docutils, and the
+timings, which depend on the machine: stages slower than the baseline by
+more than ``--tolerance`` are reported without failing. Refresh the baseline
+with ``--save`` only in changes meant to alter the rendered output.
+"""
+import argparse
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from docutils import nodes
+
+from sphinxcontrib.swaggerdoc.fetch import SpecFetcher
+from sphinxcontrib.swaggerdoc.index import SpecIndex
+from sphinxcontrib.swaggerdoc.registry import SpecRegistry
+from sphinxcontrib.swaggerdoc.spec_cache import SpecCache
+from sphinxcontrib.swaggerdoc.swaggerv2_doc import SwaggerV2DocDirective
+from sphinxcontrib.swaggerdoc.timing import count_nodes
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_spec import generate_spec  # noqa: E402
+
+PROFILES = {
+    'small': dict(paths=20, tags=4, definitions=20, depth=1, fanout=2, recursive=2),
+    'medium': dict(paths=200, tags=10, definitions=150, depth=2, fanout=3, recursive=5),
+    'large': dict(paths=1500, tags=30, definitions=1000, depth=3, fanout=4, recursive=20),
+}
+
+# Measurements that depend neither on the machine nor on the versions of Sphinx and docutils
+EXACT_METRICS = ('rendered_nodes', 'rendered_text')
+
+
+def measure(results, name, func):
+    """Run ``func`` and record its wall-clock time and peak traced memory.
+
+    Tracing slows Python code down considerably, so ``func`` is run twice:
+    once for the time and once under tracemalloc for the memory.
+    """
+    start = time.time()
+    value = func()
+    elapsed = time.time() - start
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    results[name] = {'seconds': round(elapsed, 4), 'peak_kb': peak // 1024}
+    return value
+
+
+def bare_directive(specification, limits):
+    """Create a directive usable for node construction outside of a Sphinx build."""
+    directive = SwaggerV2DocDirective.__new__(SwaggerV2DocDirective)
+    directive.api_desc = specification
+    directive.inline = True
+    for name, value in limits.items():
+        setattr(directive, name, value)
+    return directive
+
+
+def build_html(workdir, spec_path, limits):
+    from sphinx.application import Sphinx
+
+    workdir = tempfile.mkdtemp(dir=workdir)
+    srcdir = os.path.join(workdir, 'src')
+    os.makedirs(srcdir)
+    shutil.copy(spec_path, srcdir)
+    with open(os.path.join(srcdir, 'conf.py'), 'w') as fd:
+        fd.write("extensions = ['sphinxcontrib.swaggerdoc']\n"
+                 "master_doc = 'index'\n")
+        for name, value in limits.items():
+            fd.write('swaggerdoc_{} = {!r}\n'.format(name, value))
+    with open(os.path.join(srcdir, 'index.rst'), 'w') as fd:
+        fd.write('API\n===\n\n.. swaggerv2doc:: {}\n'.format(os.path.basename(spec_path)))
+
+    outdir = os.path.join(workdir, 'html')
+    doctreedir = os.path.join(workdir, 'doctrees')
+    app = Sphinx(srcdir, srcdir, outdir, doctreedir, 'html', status=None, warning=None, freshenv=True)
+    app.build()
+    return os.path.join(doctreedir, 'index.doctree')
+
+
+def run(profile, limits):
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='swaggerdoc-bench-')
+    try:
+        spec_path = os.path.join(workdir, 'spec.json')
+        with open(spec_path, 'w') as fd:
+            json.dump(generate_spec(**PROFILES[profile]), fd)
+        with open(spec_path, 'rb') as fd:
+            content = fd.read()
+
+        measure(results, 'load', lambda: SwaggerV2DocDirective.load_swagger(content, name=spec_path))
+
+        registry = SpecRegistry(None, SpecCache(os.path.join(workdir, 'cache'), 0),
+                                SpecFetcher(os.path.join(workdir, 'http')))
+        specification = measure(results, 'resolve',
+                                lambda: SwaggerV2DocDirective.resolve_swagger(registry, spec_path)[0])
+        index = measure(results, 'index', lambda: SpecIndex(specification))
+
+        directive = bare_directive(specification, limits)
+
+        def make_methods():
+            for methods in index.tags.values():
+                for path, method_type, method in methods:
+                    directive.make_method(path, method_type, method)
+
+        def make_definitions():
+            for name, obj in specification.get('definitions', {}).items():
+                directive.make_definition(name, obj)
+
+        def create_tables():
+            body = [['name{}'.format(n), 'query', 'A parameter', 'string'] for n in range(50)]
+            for n in range(200):
+                directive.create_table(['Name', 'Position', 'Description', 'Type'], body)
+
+        measure(results, 'make_method', make_methods)
+        measure(results, 'make_definition', make_definitions)
+        measure(results, 'create_table', create_tables)
+
+        entries = directive.render(index, [], directive.inline)
+        results['rendered_nodes'] = count_nodes(entries)
+        results['rendered_text'] = sum(len(entry.astext()) for entry in entries)
+
+        doctree_path = measure(results, 'build_html', lambda: build_html(workdir, spec_path, limits))
+        results['doctree_bytes'] = os.path.getsize(doctree_path)
+        with open(doctree_path, 'rb') as fd:
+            doctree = pickle.load(fd)
+        findall = getattr(doctree, 'findall', doctree.traverse)
+        results['doctree_nodes'] = sum(1 for node in findall(nodes.Node))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Compare ``results`` with ``baseline``.
+
+    Returns:
+        tuple: ``(regressions, slowdowns)`` describing the exact metrics that
+        grew and the stages slower than ``tolerance`` allows
+    """
+    regressions = []
+    slowdowns = []
+    for name, value in sorted(baseline.items()):
+        if name not in results:
+            continue
+        if name in EXACT_METRICS:
+            if results[name] > value:
+                regressions.append('{}: {} > {}'.format(name, results[name], value))
+        elif isinstance(value, dict) and results[name]['seconds'] > value['seconds'] * (1 + tolerance):
+            slowdowns.append('{}: {:.3f}s > {:.3f}s'.format(name, results[name]['seconds'], value['seconds']))
+
+    return regressions, slowdowns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='medium')
+    parser.add_argument('--save', metavar='PATH', help='Store the results as baseline of the profile')
+    parser.add_argument('--compare', metavar='PATH', help='Compare the results with a stored baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Accepted slowdown against the baseline, 0.5 is 50%%')
+    parser.add_argument('--max-depth', type=int, default=0)
+    parser.add_argument('--max-properties', type=int, default=0)
+    parser.add_argument('--max-nodes', type=int, default=0)
+    args = parser.parse_args()
+
+    limits = {'max_depth': args.max_depth, 'max_properties': args.max_properties, 'max_nodes': args.max_nodes}
+    results = run(args.profile, limits)
+    for name, value in sorted(results.items()):
+        if isinstance(value, dict):
+            print('{:<16} {:8.3f} s {:10d} KiB peak'.format(name, value['seconds'], value['peak_kb']))
+        else:
+            print('{:<16} {:8d}'.format(name, value))
+
+    if args.save:
+        baselines = {}
+        if os.path.exists(args.save):
+            with open(args.save) as fd:
+                baselines = json.load(fd)
+        baselines[args.profile] = results
+        with open(args.save, 'w') as fd:
+            json.dump(baselines, fd, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as fd:
+            baseline = json.load(fd).get(args.profile, {})
+        regressions, slowdowns = compare(results, baseline, args.tolerance)
+        for slowdown in slowdowns:
+            print('SLOWER ' + slowdown)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
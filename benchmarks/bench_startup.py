@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""Measure the cost of loading the extension at Sphinx startup.
+
+Usage::
+
+    python benchmarks/bench_startup.py [-n REPEAT] [--save baseline.json]
+    python benchmarks/bench_startup.py --compare benchmarks/baseline.json
+
+Each repetition runs in a fresh interpreter with Sphinx and
+``sphinxcontrib.httpdomain`` already imported, so only the cost of the
+extension itself is counted. Two figures are reported, as medians:
+
+* ``import``: cumulative import time of ``sphinxcontrib.swaggerdoc`` as
+  reported by ``python -X importtime``
+* ``setup``: wall time of ``app.setup_extension('sphinxcontrib.swaggerdoc')``
+  on an empty project, i.e. the import plus ``setup()``
+
+The heaviest modules imported on behalf of the extension are listed as well,
+to spot dependencies that should only be imported on first use.
+
+``--compare`` exits with status 1 when a figure got slower than the stored
+baseline by more than ``--tolerance``.
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+PACKAGE = 'sphinxcontrib.swaggerdoc'
+PROFILE = 'startup'
+
+PRELOAD = 'import sphinx.application, sphinx.util.docutils, sphinxcontrib.httpdomain'
+
+SETUP_SCRIPT = '''
+import sys, time
+{preload}
+from sphinx.application import Sphinx
+src, out = sys.argv[1], sys.argv[2]
+app = Sphinx(src, src, out, out + '/.doctrees', 'html', status=None, warning=None, freshenv=True)
+start = time.perf_counter()
+app.setup_extension({package!r})
+print(time.perf_counter() - start)
+'''.format(preload=PRELOAD, package=PACKAGE)
+
+IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(output):
+    """Return ``(cumulative_us, modules)`` of the extension from ``-X importtime`` output.
+
+    ``modules`` maps every module imported while importing the extension to
+    its cumulative import time in microseconds.
+    """
+    lines = []
+    for line in output.splitlines():
+        match = IMPORTTIME.match(line)
+        if match:
+            lines.append((int(match.group(2)), len(match.group(3)), match.group(4)))
+
+    # Children are printed before their parent, one level deeper
+    for position, (cumulative, depth, name) in enumerate(lines):
+        if name == PACKAGE:
+            break
+    else:
+        raise RuntimeError('{} does not appear in the -X importtime output'.format(PACKAGE))
+
+    modules = {}
+    for child_cumulative, child_depth, child_name in reversed(lines[:position]):
+        if child_depth <= depth:
+            break
+        modules[child_name] = child_cumulative
+
+    return cumulative, modules
+
+
+def measure_import():
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', PRELOAD + '\nimport ' + PACKAGE],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    return parse_importtime(process.stderr)
+
+
+def measure_setup(workdir):
+    src = os.path.join(workdir, 'src')
+    if not os.path.isdir(src):
+        os.makedirs(src)
+        with open(os.path.join(src, 'conf.py'), 'w') as fd:
+            fd.write('')
+        with open(os.path.join(src, 'index.rst'), 'w') as fd:
+            fd.write('Startup\n=======\n')
+
+    process = subprocess.run([sys.executable, '-c', SETUP_SCRIPT, src, os.path.join(workdir, 'out')],
+                             stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    return float(process.stdout.strip().splitlines()[-1])
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+
+def run(repeat):
+    imports, setups, modules = [], [], {}
+    workdir = tempfile.mkdtemp(prefix='swaggerdoc-startup-')
+    try:
+        for _ in range(repeat):
+            cumulative, imported = measure_import()
+            imports.append(cumulative / 1e6)
+            for name, value in imported.items():
+                modules.setdefault(name, []).append(value)
+            setups.append(measure_setup(workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        'import': {'seconds': median(imports)},
+        'setup': {'seconds': median(setups)},
+    }
+    heaviest = sorted(((median(values), name) for name, values in modules.items()), reverse=True)
+    return results, heaviest
+
+
+def compare(results, baseline, tolerance):
+    """Return a description of every regression of ``results`` against ``baseline``."""
+    regressions = []
+    for name, value in sorted(baseline.items()):
+        if name in results and results[name]['seconds'] > value['seconds'] * (1 + tolerance):
+            regressions.append('{}: {:.4f}s > {:.4f}s'.format(name, results[name]['seconds'], value['seconds']))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--repeat', type=int, default=7)
+    parser.add_argument('--top', type=int, default=10, help='Number of imported modules to list')
+    parser.add_argument('--save', metavar='PATH', help='Store the results as startup baseline')
+    parser.add_argument('--compare', metavar='PATH', help='Compare the results with a stored baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Accepted slowdown against the baseline, 0.5 is 50%%')
+    args = parser.parse_args()
+
+    results, heaviest = run(args.repeat)
+    for name, value in sorted(results.items()):
+        print('{:<16} {:8.1f} ms'.format(name, value['seconds'] * 1000))
+    print('\nHeaviest imports of {}:'.format(PACKAGE))
+    for value, name in heaviest[:args.top]:
+        print('  {:<48} {:8.1f} ms'.format(name, value / 1000.0))
+
+    if args.save:
+        baselines = {}
+        if os.path.exists(args.save):
+            with open(args.save) as fd:
+                baselines = json.load(fd)
+        baselines[PROFILE] = results
+        with open(args.save, 'w') as fd:
+            json.dump(baselines, fd, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as fd:
+            baseline = json.load(fd).get(PROFILE, {})
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
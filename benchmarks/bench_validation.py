@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Compare the validation backends and the validation modes.
+
+Usage::
+
+    python benchmarks/bench_validation.py [--profile large] [-n REPEAT]
+    python benchmarks/bench_validation.py --spec swagger.yaml
+    python benchmarks/bench_validation.py --compare benchmarks/baseline.json
+
+The description, synthetic or given with ``--spec``, is resolved once. Every
+validation backend installed is then timed on it, followed by the cost of
+``swaggerdoc_validation = 'cached'`` once the description passed validation,
+and by a full load of the description (cache miss) in each mode.
+
+``--compare`` exits with status 1 when the cached check or the load in cached
+mode got slower than the stored baseline by more than ``--tolerance``.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+from prance.util import validation_backends
+from prance.util.resolver import RESOLVE_FILES, RESOLVE_HTTP, RefResolver
+
+from sphinxcontrib.swaggerdoc.fetch import SpecFetcher
+from sphinxcontrib.swaggerdoc.fingerprint import collect_sources
+from sphinxcontrib.swaggerdoc.loader import load_spec
+from sphinxcontrib.swaggerdoc.registry import SpecRegistry
+from sphinxcontrib.swaggerdoc.spec_cache import SpecCache
+from sphinxcontrib.swaggerdoc.swaggerv2_doc import SwaggerV2DocDirective
+from sphinxcontrib.swaggerdoc.validation import check_spec, validate
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_stages import PROFILES  # noqa: E402
+from generate_spec import generate_spec  # noqa: E402
+
+
+class Config(object):
+    """The configuration values the loading of a description reads."""
+
+    def __init__(self, validation, backend=None):
+        self.swaggerdoc_validation = validation
+        self.swaggerdoc_validation_backend = backend
+
+
+def best(func, repeat):
+    return round(min(timeit.repeat(func, number=1, repeat=repeat)), 4)
+
+
+def run(spec_path, repeat):
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='swaggerdoc-validation-')
+    try:
+        with open(spec_path, 'rb') as fd:
+            content = fd.read()
+        fetcher = SpecFetcher(os.path.join(workdir, 'http'))
+        document = load_spec(content, name=spec_path)
+        sources = collect_sources(fetcher, spec_path, content, document)
+        resolver = RefResolver(document, spec_path, resolve_types=RESOLVE_FILES | RESOLVE_HTTP)
+        resolver.resolve_references()
+        specification = resolver.specs
+
+        for backend in validation_backends():
+            results['backend ' + backend] = best(lambda: validate(specification, spec_path, backend), repeat)
+
+        def make_registry(validation, directory):
+            registry = SpecRegistry(Config(validation), SpecCache(directory), fetcher)
+            # Bypass the cache of resolved specifications, keep the validation markers
+            registry.cache = SpecCache(directory, 0)
+            return registry
+
+        registry = make_registry('cached', os.path.join(workdir, 'cache'))
+        check_spec(registry, specification, sources, spec_path, {})
+        results['cached check'] = best(lambda: check_spec(registry, specification, sources, spec_path, {}), repeat)
+
+        for validation in ('always', 'cached', 'off'):
+            registry = make_registry(validation, os.path.join(workdir, validation))
+            SwaggerV2DocDirective.resolve_swagger(registry, spec_path)  # Leaves the marker in cached mode
+            results['load ' + validation] = best(lambda: SwaggerV2DocDirective.resolve_swagger(registry, spec_path),
+                                                 repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='large')
+    parser.add_argument('--spec', help='Description to validate instead of a synthetic one')
+    parser.add_argument('-n', '--repeat', type=int, default=3)
+    parser.add_argument('--save', metavar='PATH', help='Store the results as baseline')
+    parser.add_argument('--compare', metavar='PATH', help='Compare the results with a stored baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Accepted slowdown against the baseline, 0.5 is 50%%')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='swaggerdoc-spec-')
+    try:
+        spec_path = args.spec and os.path.abspath(args.spec)
+        if spec_path is None:
+            spec_path = os.path.join(workdir, 'spec.json')
+            with open(spec_path, 'w') as fd:
+                json.dump(generate_spec(**PROFILES[args.profile]), fd)
+        results = run(spec_path, args.repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for name, seconds in sorted(results.items()):
+        print('{:<40} {:8.3f} s'.format(name, seconds))
+
+    key = 'validation-{}'.format(os.path.basename(args.spec) if args.spec else args.profile)
+    if args.save:
+        baselines = {}
+        if os.path.exists(args.save):
+            with open(args.save) as fd:
+                baselines = json.load(fd)
+        baselines[key] = results
+        with open(args.save, 'w') as fd:
+            json.dump(baselines, fd, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as fd:
+            baseline = json.load(fd).get(key, {})
+        regressions = ['{}: {:.3f}s > {:.3f}s'.format(name, results[name], baseline[name])
+                       for name in ('cached check', 'load cached')
+                       if name in baseline and results[name] > baseline[name] * (1 + args.tolerance)]
+        if regressions:
+            print('REGRESSION ' + ', '.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
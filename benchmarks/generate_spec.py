@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Generate synthetic Swagger 2.0 descriptions for benchmarking.
+
+Usage::
+
+    python benchmarks/generate_spec.py -o spec.json --paths 500 --tags 20 --definitions 300
+
+The output is deterministic for a given set of parameters, so benchmark
+results can be compared across runs.
+"""
+import argparse
+import json
+import random
+
+SCALAR_TYPES = ('string', 'integer', 'boolean')
+METHODS = ('get', 'post', 'put', 'delete')
+
+
+def make_object(rng, depth, definitions, properties):
+    """Build an inline object schema nested ``depth`` levels deep."""
+    schema = {'type': 'object', 'properties': {}, 'required': []}
+    for n in range(properties):
+        name = 'field{}'.format(n)
+        choice = rng.random()
+        if depth > 0 and n == 0:
+            prop = make_object(rng, depth - 1, definitions, max(2, properties // 2))
+        elif definitions and choice < 0.3:
+            prop = {'$ref': '#/definitions/{}'.format(rng.choice(definitions))}
+        elif definitions and choice < 0.4:
+            prop = {'type': 'array', 'items': {'$ref': '#/definitions/{}'.format(rng.choice(definitions))}}
+        else:
+            prop = {'type': rng.choice(SCALAR_TYPES), 'description': 'Property {}'.format(n)}
+        schema['properties'][name] = prop
+        if n % 3 == 0:
+            schema['required'].append(name)
+
+    return schema
+
+
+def generate_spec(paths=100, tags=10, definitions=100, depth=2, fanout=3, recursive=5,
+                  properties=6, seed=0):
+    """Generate a Swagger 2.0 description.
+
+    Args:
+        paths (int): Number of paths, each with one or two operations
+        tags (int): Number of tags the operations are spread over
+        definitions (int): Number of entries in ``definitions``
+        depth (int): Nesting depth of inline objects inside each definition
+        fanout (int): Number of references from each operation to definitions
+        recursive (int): Number of self-referencing definitions
+        properties (int): Number of properties of each object
+        seed (int): Seed of the random generator
+
+    Returns:
+        dict: The description
+    """
+    rng = random.Random(seed)
+    names = ['Model{}'.format(n) for n in range(definitions)]
+
+    spec = {
+        'swagger': '2.0',
+        'info': {'title': 'Synthetic', 'version': '1.0'},
+        'basePath': '/v1',
+        'tags': [{'name': 'tag{}'.format(n)} for n in range(tags)],
+        'paths': {},
+        'responses': {
+            'NotFound': {'description': 'Not found', 'schema': {'$ref': '#/definitions/Error'}},
+        },
+        'definitions': {
+            'Error': {
+                'type': 'object',
+                'properties': {'code': {'type': 'integer'}, 'message': {'type': 'string'}},
+            },
+        },
+    }
+
+    # Definitions only reference earlier ones, so the graph has no cycles
+    # besides the explicitly recursive models
+    for n, name in enumerate(names):
+        spec['definitions'][name] = make_object(rng, depth, names[:n], properties)
+
+    for n in range(min(recursive, definitions)):
+        spec['definitions'][names[n]]['properties']['children'] = {
+            'type': 'array', 'items': {'$ref': '#/definitions/{}'.format(names[n])},
+        }
+
+    for n in range(paths):
+        operations = {}
+        for method in rng.sample(METHODS, rng.randint(1, 2)):
+            refs = [rng.choice(names) for i in range(fanout)] if names else []
+            parameters = [{'in': 'path', 'name': 'id', 'required': True, 'type': 'integer'}]
+            if refs and method in ('post', 'put'):
+                parameters.append({'in': 'body', 'name': 'body', 'schema': {'$ref': '#/definitions/' + refs[0]}})
+            responses = {'404': {'$ref': '#/responses/NotFound'}}
+            for code, ref in zip(('200', '201', '202'), refs):
+                responses[code] = {'description': 'ok', 'schema': {'$ref': '#/definitions/' + ref}}
+
+            operations[method] = {
+                'tags': ['tag{}'.format(n % tags)] if tags else [],
+                'operationId': '{}Resource{}'.format(method, n),
+                'summary': 'Operation {} on resource {}'.format(method, n),
+                'produces': ['application/json'],
+                'parameters': parameters,
+                'responses': responses,
+            }
+        spec['paths']['/resource{}/{{id}}'.format(n)] = operations
+
+    return spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', required=True, help='Output file, .json or .yaml')
+    parser.add_argument('--paths', type=int, default=100)
+    parser.add_argument('--tags', type=int, default=10)
+    parser.add_argument('--definitions', type=int, default=100)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--fanout', type=int, default=3)
+    parser.add_argument('--recursive', type=int, default=5)
+    parser.add_argument('--properties', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    spec = generate_spec(args.paths, args.tags, args.definitions, args.depth, args.fanout,
+                         args.recursive, args.properties, args.seed)
+
+    with open(args.output, 'w') as fd:
+        if args.output.endswith(('.yaml', '.yml')):
+            import yaml
+            yaml.safe_dump(spec, fd, default_flow_style=False)
+        else:
+            json.dump(spec, fd, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
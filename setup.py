@@ -31,5 +31,6 @@ setup(
         'Topic :: Utilities'
     ],
     packages=find_packages(),
-    install_requires=['sphinx', 'requests', 'requests-file', 'future', 'sphinxcontrib-httpdomain']
+    install_requires=['sphinx>=1.6', 'requests', 'requests-file', 'sphinxcontrib-httpdomain', 'six', 'prance',
+                      'PyYAML', 'futures; python_version < "3"']
 )
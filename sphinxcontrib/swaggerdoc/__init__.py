@@ -1,5 +1,16 @@
 from .swagger_doc import SwaggerDocDirective
 from .swaggerv2_doc import SwaggerV2DocDirective
+from .aggregate import SwaggerV2AggregateDirective
+from .domain import SwaggerDomain
+from .fingerprint import get_outdated
+from .pages import generate_pages
+from . import parallel
+from . import html_tables
+from .prefetch import prefetch_specs
+from .registry import release_descriptions
+from . import timing
+from .util import merge_info, purge_doc
+from .validation import check_config
 
 
 def setup(app):
@@ -12,7 +23,43 @@ def setup(app):
     """
     app.setup_extension('sphinxcontrib.httpdomain')
 
+    app.add_config_value('swaggerdoc_cache_dir', None, '')
+    app.add_config_value('swaggerdoc_cache_max_size', 256 * 1024 * 1024, '')
+    app.add_config_value('swaggerdoc_http_timeout', (10, 60), '')
+    app.add_config_value('swaggerdoc_http_retries', 3, '')
+    app.add_config_value('swaggerdoc_prefetch_workers', 8, '')
+    app.add_config_value('swaggerdoc_render_mode', 'inline', 'env')
+    app.add_config_value('swaggerdoc_timing_report', None, '')
+    app.add_config_value('swaggerdoc_max_depth', 0, 'env')
+    app.add_config_value('swaggerdoc_max_properties', 0, 'env')
+    app.add_config_value('swaggerdoc_max_nodes', 0, 'env')
+    app.add_config_value('swaggerdoc_pages', {}, 'env')
+    app.add_config_value('swaggerdoc_validation', 'cached', '')
+    app.add_config_value('swaggerdoc_validation_backend', None, '')
+    app.add_config_value('swaggerdoc_render_workers', 0, '')
+    app.add_config_value('swaggerdoc_html_tables', False, 'env')
+
     app.add_directive('swaggerdoc', SwaggerDocDirective)
     app.add_directive('swaggerv2doc', SwaggerV2DocDirective)
+    app.add_directive('swaggerv2aggregate', SwaggerV2AggregateDirective)
+    app.add_domain(SwaggerDomain)
+    app.add_node(html_tables.swaggerdoc_table, html=(html_tables.visit_swaggerdoc_table, None))
+
+    app.connect('builder-inited', check_config)
+    app.connect('builder-inited', parallel.check_config)
+    app.connect('builder-inited', generate_pages)
+    app.connect('builder-inited', html_tables.init_renderer)
+    app.connect('env-get-outdated', get_outdated)
+    app.connect('env-purge-doc', purge_doc)
+    app.connect('env-merge-info', merge_info)
+    app.connect('env-get-outdated', html_tables.get_outdated)
+    app.connect('doctree-resolved', html_tables.resolve_xrefs)
+    app.connect('env-before-read-docs', prefetch_specs)
+    app.connect('env-updated', release_descriptions)
+    app.connect('build-finished', timing.write_report)
 
-    return {'version': '0.1.4'}
+    return {
+        'version': '0.1.4',
+        'parallel_read_safe': True,
+        'parallel_write_safe': True,
+    }
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Command line tools of sphinxcontrib-swaggerdoc.
+
+Usage::
+
+    python -m sphinxcontrib.swaggerdoc compile spec.yaml -o spec.swgc
+
+``compile`` resolves, validates and indexes a Swagger 2.0 description once
+and writes the result to a file the directives load directly.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+from .artifact import SUFFIX, write_artifact
+from .fetch import SpecFetcher, is_local
+from .registry import SpecRegistry
+from .spec_cache import SpecCache
+from .swaggerv2_doc import SwaggerV2DocDirective
+
+
+def compile_spec(location, output):
+    """Compile the description at ``location`` into ``output``.
+
+    Returns:
+        SpecIndex: Index of the compiled description
+    """
+    if is_local(location):
+        location = os.path.abspath(location)
+
+    workdir = tempfile.mkdtemp(prefix='swaggerdoc-')
+    try:
+        registry = SpecRegistry(None, SpecCache(workdir, 0), SpecFetcher(workdir))
+        specification, sources, index = SwaggerV2DocDirective.resolve_swagger(registry, location)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    write_artifact(output, specification, index)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sphinxcontrib.swaggerdoc',
+                                     description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command')
+    compile_parser = commands.add_parser('compile', help='Compile a Swagger 2.0 description')
+    compile_parser.add_argument('spec', help='Path or URL of the description')
+    compile_parser.add_argument('-o', '--output', help='Output file, defaults to the description with a {} suffix'
+                                .format(SUFFIX))
+    args = parser.parse_args(argv)
+
+    if args.command != 'compile':
+        parser.print_help()
+        return 2
+
+    output = args.output
+    if output is None:
+        name = os.path.basename(args.spec.rstrip('/')) or 'spec'
+        output = os.path.splitext(name)[0] + SUFFIX
+
+    try:
+        index = compile_spec(args.spec, output)
+    except Exception as e:
+        sys.stderr.write('Unable to compile {}: {}\n'.format(args.spec, e))
+        return 1
+
+    print('Wrote {} ({} operations)'.format(output, len(index.pointers)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+import glob
+import hashlib
+import json
+import os
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from docutils import nodes
+from docutils.parsers.rst import directives
+from sphinx.util import logging
+
+from .domain import operation_name
+from .fetch import is_local
+from .fingerprint import note_sources
+from .fragments import note_fragments
+from .html_tables import HTML, current_renderer, note_renderer
+from .index import HTTP_METHODS
+from .refs import is_internal, make_ref
+from .registry import SpecEntry, get_registry
+from .swaggerv2_doc import SECTIONS, SwaggerV2DocDirective, paused_gc, sections_option
+from .timing import DirectiveTiming
+
+logger = logging.getLogger(__name__)
+
+# Sections whose entries are shared between services when identical
+MERGED_SECTIONS = ('definitions', 'responses', 'parameters')
+
+GLOB_CHARS = '*?['
+
+
+def split_ref(ref):
+    """Split an internal ``$ref`` into a merged section ``(section, name, rest)``, ``None`` for other references."""
+    if not is_internal(ref):
+        return None
+
+    parts = ref[2:].split('/', 2)
+    if len(parts) < 2 or parts[0] not in MERGED_SECTIONS:
+        return None
+
+    name = parts[1].replace('~1', '/').replace('~0', '~')
+    return parts[0], name, parts[2] if len(parts) > 2 else None
+
+
+def service_name(entry):
+    """Name a service after the title of its description, else after its file name."""
+    title = entry.specification.get('info', {}).get('title')
+    if title:
+        return title
+
+    basename = entry.location.rstrip('/').rsplit('/', 1)[-1]
+    return os.path.splitext(basename)[0] or entry.location
+
+
+class MergedSpec(object):
+    """Swagger 2.0 descriptions of several services merged into one specification.
+
+    Entries of ``definitions``, ``responses`` and ``parameters`` are compared by
+    structure: two entries with the same name are the same entry when they are
+    equal once the entries they reference are compared the same way. Each
+    distinct entry appears once in the merged specification. When services
+    disagree on an entry, the variant used by most services keeps the name and
+    the others are renamed after the first service using them, e.g.
+    ``Error (billing)``. References of every service are rewritten accordingly.
+
+    Attributes:
+        specification (dict): Merged ``definitions``, ``responses`` and ``parameters``
+        services (list): ``(name, operations)`` for each service, in order, with
+            operations as ``(path, method_type, method)``
+        users (dict): ``(section, name)`` of each merged entry to the names of
+            the services using it
+    """
+
+    def __init__(self, services):
+        """
+        Args:
+            services (list): ``(name, specification)`` for each service
+        """
+        self._specs = [specification for name, specification in services]
+        self._keys = {}
+        self._names = {}
+
+        self.specification = dict((section, OrderedDict()) for section in MERGED_SECTIONS)
+        self.users = {}
+
+        # Every entry is named before any reference is rewritten
+        variants = [(section, self._name_section(section, [name for name, specification in services]))
+                    for section in MERGED_SECTIONS]
+        for section, by_name in variants:
+            for name, by_key in by_name.items():
+                for key, positions in by_key.items():
+                    position = positions[0]
+                    merged_name = self._names[(position, section, name)]
+                    self.specification[section][merged_name] = self._rewrite(self._specs[position][section][name],
+                                                                             position)
+
+        self.services = []
+        for position, (name, specification) in enumerate(services):
+            operations = []
+            for path, methods in specification.get('paths', {}).items():
+                for method_type, method in methods.items():
+                    if method_type in HTTP_METHODS:
+                        operations.append((path, method_type, self._rewrite(method, position)))
+            self.services.append((name, operations))
+
+    def _name_section(self, section, service_names):
+        """Group the entries of a section by name and structure and name the merged entries.
+
+        Returns:
+            OrderedDict: Name to ``OrderedDict`` of structure key to the
+            positions of the services whose entry has that structure
+        """
+        variants = OrderedDict()  # name -> structure key -> positions of the services
+        for position, specification in enumerate(self._specs):
+            for name in specification.get(section, {}):
+                key = self._structure_key(position, section, name, ())
+                variants.setdefault(name, OrderedDict()).setdefault(key, []).append(position)
+
+        for name, by_key in variants.items():
+            # The most used variant keeps the name, ties go to the first one
+            ranked = sorted(by_key.items(), key=lambda item: -len(item[1]))
+            for rank, (key, positions) in enumerate(ranked):
+                merged_name = name if rank == 0 else u'{} ({})'.format(name, service_names[positions[0]])
+                for position in positions:
+                    self._names[(position, section, name)] = merged_name
+                self.users[(section, merged_name)] = [service_names[position] for position in positions]
+
+        return variants
+
+    def _structure_key(self, position, section, name, stack):
+        """Hash an entry with the entries it references replaced by their own hash."""
+        key = (position, section, name)
+        if key in self._keys:
+            return self._keys[key]
+        if key in stack:
+            return u'{}/{}'.format(section, name)  # Recursive entries compare by name
+
+        obj = self._specs[position].get(section, {}).get(name)
+        value = self._substitute(obj, position, stack + (key,))
+        digest = hashlib.sha256(json.dumps(value, sort_keys=True, separators=(',', ':'),
+                                           default=str).encode('utf-8')).hexdigest()
+        self._keys[key] = digest
+        return digest
+
+    def _substitute(self, obj, position, stack):
+        if isinstance(obj, dict):
+            target = split_ref(obj.get('$ref'))
+            result = dict((key, self._substitute(value, position, stack)) for key, value in obj.items())
+            if target is not None:
+                section, name, rest = target
+                result['$ref'] = [self._structure_key(position, section, name, stack), rest]
+            return result
+        if isinstance(obj, list):
+            return [self._substitute(value, position, stack) for value in obj]
+        return obj
+
+    def _rewrite(self, obj, position):
+        """Copy ``obj`` with its references pointing to the merged entries."""
+        if isinstance(obj, dict):
+            result = dict((key, self._rewrite(value, position)) for key, value in obj.items())
+            target = split_ref(obj.get('$ref'))
+            if target is not None:
+                section, name, rest = target
+                ref = make_ref(section, self._names.get((position, section, name), name))
+                result['$ref'] = ref + '/' + rest if rest is not None else ref
+            return result
+        if isinstance(obj, list):
+            return [self._rewrite(value, position) for value in obj]
+        return obj
+
+
+class SwaggerV2AggregateDirective(SwaggerV2DocDirective):
+    """Document the operations of several Swagger 2.0 descriptions with a single set of models.
+
+    The content lists the descriptions, one per line: paths relative to the
+    document, which may be glob patterns, or URLs. Descriptions are loaded
+    concurrently. Operations are grouped by service; definitions and responses
+    shared by several services are rendered once, with the services using them.
+    """
+
+    has_content = True
+
+    option_spec = {
+        'sections': sections_option,
+        'spec-name': directives.unchanged_required,
+    }
+
+    def locate_sources(self):
+        """Return the absolute paths and URLs of the listed descriptions, in order."""
+        env = self.state.document.settings.env
+        locations = []
+        for line in self.content:
+            line = line.strip()
+            if not line:
+                continue
+
+            location = self.locate_swagger(line)
+            if is_local(location) and any(char in line for char in GLOB_CHARS):
+                matches = sorted(glob.glob(location))
+                if not matches:
+                    logger.warning('No Swagger description matches %s', line, location=(env.docname, self.lineno))
+                locations.extend(matches)
+            else:
+                locations.append(location)
+
+        return locations
+
+    def load_services(self, locations):
+        """Load the descriptions at ``locations`` concurrently.
+
+        Returns:
+            list: ``(location, entry)`` in order, where ``entry`` is the
+            exception raised if the description failed to load
+        """
+        registry = get_registry(self.state.document.settings.env)
+
+        def load(location):
+            try:
+                return registry.get('swaggerv2doc', location, lambda: self.load_entry(registry, location))
+            except Exception as e:
+                return e
+
+        workers = registry.config.swaggerdoc_prefetch_workers or 1
+        executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(locations))))
+        try:
+            return list(zip(locations, executor.map(load, locations)))
+        finally:
+            executor.shutdown()
+
+    def run(self):
+        self.reporter = self.state.document.reporter
+        env = self.state.document.settings.env
+        timing = DirectiveTiming('swaggerv2aggregate', env)
+        # The output of the directive is not tracked fragment by fragment
+        note_fragments(env, None)
+
+        try:
+            services = []
+            sources = {}
+            names = set()
+            with timing.stage('fetch'):
+                loaded = self.load_services(self.locate_sources())
+
+            for location, entry in loaded:
+                if isinstance(entry, Exception):
+                    logger.warning('Unable to process URL: %s: %s', location, entry,
+                                   location=(env.docname, self.lineno))
+                    # Read the document again once the description can be loaded
+                    note_sources(env, {location: None})
+                    continue
+
+                note_sources(env, entry.sources)
+                sources.update(entry.sources)
+                name = service_name(entry)
+                while name in names:
+                    name += "'"
+                names.add(name)
+                services.append((name, entry))
+
+            with timing.stage('merge'):
+                merged = MergedSpec([(name, entry.specification) for name, entry in services])
+            self.api_desc = merged.specification
+
+            self.max_depth = env.config.swaggerdoc_max_depth
+            self.max_properties = env.config.swaggerdoc_max_properties
+            self.max_nodes = env.config.swaggerdoc_max_nodes
+            self.spec_name = self.options.get('spec-name')
+            self.refdoc = env.docname
+            self.render_workers = env.config.swaggerdoc_render_workers
+            self.html_tables = current_renderer(env) == HTML
+            note_renderer(env)
+            with timing.stage('render'), paused_gc():
+                entries = self.render_services(merged, env.config.swaggerdoc_render_mode != 'reference',
+                                               self.options.get('sections', SECTIONS))
+
+            load = {}
+            for name, entry in services:
+                for stage, seconds in entry.timings.items():
+                    load[stage] = load.get(stage, 0) + seconds
+            timing.finish(SpecEntry(u' '.join(self.content).strip(), merged.specification, sources=sources,
+                                    timings=load), entries)
+            return entries
+        except Exception as e:
+            logger.warning('Unable to aggregate Swagger descriptions: %s', e, location=(env.docname, self.lineno))
+            logger.verbose(traceback.format_exc())
+
+            error = nodes.error('')
+            error += nodes.paragraph('', 'Unable to aggregate the Swagger descriptions. '
+                                         'See console output for a more detailed error')
+            return [error]
+
+    def render_services(self, merged, inline, sections=SECTIONS):
+        """Create the nodes of the operations of every service and of the merged responses and definitions.
+
+        Args:
+            merged (MergedSpec): The merged descriptions
+            inline (bool): Inline internal references instead of linking them
+            sections (list): Parts of the description to render, see ``SECTIONS``
+        """
+        self.inline = inline
+        self._nodes = 0
+
+        entries = []
+
+        if 'methods' in sections:
+            method_section = self.create_section('Methods')
+            for service, operations in merged.services:
+                section = self.create_section(service)
+                for path, method_type, method in operations:
+                    method_nodes = self.make_method(path, method_type, method)
+                    if self.spec_name is not None:
+                        # Operations are named per service, models are shared
+                        self.note_object(method_nodes[0], 'methods', operation_name(path, method_type, method),
+                                         spec_name=u'{}/{}'.format(self.spec_name, service))
+                    section += method_nodes
+                method_section.append(section)
+            entries.append(method_section)
+
+        for name, title in (('responses', 'Responses'), ('definitions', 'Definitions')):
+            if name not in sections:
+                continue
+
+            outer = self.create_section(title)
+            objs = merged.specification[name]
+            for entry_name, section in zip(objs, self.make_entries(name, objs)):
+                section.insert(1, self.make_users(merged.users[(name, entry_name)]))
+                if self.spec_name is not None:
+                    self.note_object(section, name, entry_name)
+                outer.append(section)
+            entries.append(outer)
+
+        return entries
+
+    def make_users(self, services):
+        paragraph = nodes.paragraph()
+        paragraph += nodes.emphasis('', 'Used by: ')
+        paragraph += nodes.Text(', '.join(services))
+        return paragraph
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import mmap
+import pickle
+import struct
+
+import six
+
+from .util import atomic_write
+
+MAGIC = b'SWGC'
+SUFFIX = '.swgc'
+
+# Bump whenever the layout of the pickled values changes
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct('>4sH')
+
+
+def dumps_artifact(specification, index):
+    """Return the raw bytes of a compiled description.
+
+    A compiled description holds the resolved and validated specification and
+    its ``SpecIndex``, so loading it skips YAML parsing, prance and indexing. It
+    is a fixed header followed by a pickle of both. As with any pickle, only
+    load compiled descriptions from sources you trust.
+    """
+    return HEADER.pack(MAGIC, FORMAT_VERSION) + pickle.dumps({
+        'specification': specification,
+        'index': index,
+    }, pickle.HIGHEST_PROTOCOL)
+
+
+def loads_artifact(content):
+    """Return ``(specification, index)`` stored in the raw bytes of a compiled description.
+
+    Args:
+        content: bytes-like object, e.g. a ``mmap``
+
+    Raises:
+        ValueError: When ``content`` is not a compiled description of this version
+    """
+    if len(content) < HEADER.size:
+        raise ValueError('Not a compiled Swagger description')
+
+    magic, version = HEADER.unpack_from(content)
+    if magic != MAGIC:
+        raise ValueError('Not a compiled Swagger description')
+    if version != FORMAT_VERSION:
+        raise ValueError('Compiled description has format {}, expected {}; compile it again'.format(
+            version, FORMAT_VERSION))
+
+    if six.PY2:
+        value = pickle.loads(content[HEADER.size:])  # Python 2 cannot unpickle a memoryview
+    else:
+        view = memoryview(content)
+        try:
+            value = pickle.loads(view[HEADER.size:])
+        finally:
+            view.release()
+
+    return value['specification'], value['index']
+
+
+def read_artifact(path):
+    """Read a compiled description through a memory map instead of copying the file into memory.
+
+    Returns:
+        tuple: ``(specification, index, content_hash)`` where ``content_hash`` is
+        the sha256 hex digest of the file
+    """
+    with open(path, 'rb') as fd:
+        mapped = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            specification, index = loads_artifact(mapped)
+            content_hash = hashlib.sha256(mapped).hexdigest()
+        finally:
+            mapped.close()
+
+    return specification, index, content_hash
+
+
+def write_artifact(path, specification, index):
+    """Write a compiled description to ``path`` atomically."""
+    with atomic_write(path, shared=True) as fd:
+        fd.write(dumps_artifact(specification, index))
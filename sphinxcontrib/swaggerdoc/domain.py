@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+from docutils import nodes
+from sphinx.domains import Domain, ObjType
+from sphinx.locale import _
+from sphinx.roles import XRefRole
+from sphinx.util import logging
+from sphinx.util.nodes import make_refnode
+
+logger = logging.getLogger(__name__)
+
+# Object type of the entries of each section of a description
+OBJECT_TYPES = {
+    'methods': 'operation',
+    'responses': 'response',
+    'definitions': 'definition',
+}
+
+# Role linking to the entries of each section
+SECTION_ROLES = {
+    'methods': 'op',
+    'responses': 'resp',
+    'definitions': 'def',
+}
+
+# Object type each role links to
+ROLE_TYPES = {
+    'op': 'operation',
+    'resp': 'response',
+    'def': 'definition',
+}
+
+
+def make_target(spec_name, name):
+    """Return the target of a cross-reference, e.g. ``petstore:Pet``."""
+    return u'{}:{}'.format(spec_name, name)
+
+
+def split_target(target):
+    """Split a cross-reference target into ``(spec_name, name)``, ``spec_name`` is ``None`` when missing."""
+    if ':' not in target:
+        return None, target
+    spec_name, name = target.split(':', 1)
+    return spec_name.strip(), name.strip()
+
+
+def operation_name(path, method_type, method):
+    """Name of an operation: its ``operationId``, else the method and path, e.g. ``GET /pets``."""
+    return method.get('operationId') or u'{} {}'.format(method_type.upper(), path)
+
+
+def normalize_name(objtype, name):
+    if objtype == 'operation' and ' ' in name:
+        method_type, path = name.split(' ', 1)
+        return u'{} {}'.format(method_type.upper(), path.strip())
+    return name
+
+
+class SwaggerXRefRole(XRefRole):
+    """Role of the ``swagger`` domain, whose target is ``spec-name:name``.
+
+    Without an explicit title, the link shows the name alone.
+    """
+
+    def process_link(self, env, refnode, has_explicit_title, title, target):
+        if not has_explicit_title:
+            title = split_target(title)[1]
+        return title, target
+
+
+class SwaggerDomain(Domain):
+    """Operations, responses and definitions of the descriptions rendered with a ``:spec-name:``.
+
+    Objects are stored in ``self.data['objects']`` keyed by
+    ``(objtype, spec_name, name)``, so resolving a reference is a single
+    dictionary lookup whatever the number of descriptions. They are exported
+    to the ``objects.inv`` inventory for intersphinx.
+
+    An operation with several tags is rendered under each of them. Only the
+    section of its first tag registers it in ``objects``, the others are kept
+    in ``self.data['secondary']`` and only used when that section is not
+    rendered anywhere.
+    """
+
+    name = 'swagger'
+    label = 'Swagger'
+    data_version = 1
+
+    object_types = {
+        'operation': ObjType(_('operation'), 'op'),
+        'response': ObjType(_('response'), 'resp'),
+        'definition': ObjType(_('definition'), 'def'),
+    }
+
+    roles = {
+        'op': SwaggerXRefRole(warn_dangling=True),
+        'resp': SwaggerXRefRole(warn_dangling=True),
+        'def': SwaggerXRefRole(warn_dangling=True),
+    }
+
+    dangling_warnings = {
+        'op': 'undefined Swagger operation: %(target)s',
+        'resp': 'undefined Swagger response: %(target)s',
+        'def': 'undefined Swagger definition: %(target)s',
+    }
+
+    initial_data = {
+        'objects': {},  # (objtype, spec_name, name) -> (docname, node_id)
+        'secondary': {},  # (objtype, spec_name, name) -> (docname, node_id)
+    }
+
+    @property
+    def objects(self):
+        return self.data['objects']
+
+    @property
+    def secondary(self):
+        return self.data['secondary']
+
+    def note_object(self, objtype, spec_name, name, node_id, location=None, primary=True):
+        """Register an object rendered in the current document under ``node_id``.
+
+        Secondary places of an object never warn about duplicates. The one of
+        the first document by name is kept, whatever the order documents are
+        read in.
+        """
+        key = (objtype, spec_name, name)
+        if not primary:
+            place = (self.env.docname, node_id)
+            self.secondary[key] = min(self.secondary.get(key, place), place)
+            return
+
+        if key in self.objects:
+            logger.warning('duplicate Swagger %s %s, other instance in %s', objtype,
+                           make_target(spec_name, name), self.objects[key][0], location=location)
+        self.objects[key] = (self.env.docname, node_id)
+
+    def clear_doc(self, docname):
+        for objects in (self.objects, self.secondary):
+            for key, (obj_docname, node_id) in list(objects.items()):
+                if obj_docname == docname:
+                    del objects[key]
+
+    def merge_domaindata(self, docnames, otherdata):
+        for key, (docname, node_id) in otherdata['objects'].items():
+            if docname in docnames:
+                self.objects[key] = (docname, node_id)
+        for key, place in otherdata['secondary'].items():
+            if place[0] in docnames:
+                self.secondary[key] = min(self.secondary.get(key, place), place)
+
+    def find_object(self, objtype, target):
+        spec_name, name = split_target(target)
+        if spec_name is None:
+            return None
+        key = (objtype, spec_name, normalize_name(objtype, name))
+        return self.objects.get(key) or self.secondary.get(key)
+
+    def resolve_xref(self, env, fromdocname, builder, typ, target, node, contnode):
+        objtype = ROLE_TYPES.get(typ)
+        found = objtype and self.find_object(objtype, target)
+        if not found:
+            return None
+
+        docname, node_id = found
+        return make_refnode(builder, fromdocname, docname, node_id, contnode, target)
+
+    def resolve_any_xref(self, env, fromdocname, builder, target, node, contnode):
+        results = []
+        for role, objtype in sorted(ROLE_TYPES.items()):
+            found = self.find_object(objtype, target)
+            if found:
+                docname, node_id = found
+                results.append(('swagger:' + role,
+                                make_refnode(builder, fromdocname, docname, node_id, contnode, target)))
+        return results
+
+    def get_objects(self):
+        for (objtype, spec_name, name), (docname, node_id) in self.objects.items():
+            target = make_target(spec_name, name)
+            yield target, target, objtype, docname, node_id, 1
+        for (objtype, spec_name, name), (docname, node_id) in self.secondary.items():
+            if (objtype, spec_name, name) not in self.objects:
+                target = make_target(spec_name, name)
+                yield target, target, objtype, docname, node_id, 1
+
+
+def make_node_id(document, spec_name, objtype, name):
+    """Return an id for an object that is unique in ``document``."""
+    node_id = nodes.make_id(u'swagger-{}-{}-{}'.format(spec_name, objtype, name))
+    candidate = node_id
+    counter = 0
+    while candidate in document.ids:
+        counter += 1
+        candidate = u'{}-{}'.format(node_id, counter)
+    return candidate
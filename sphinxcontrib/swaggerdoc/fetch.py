@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import threading
+
+from six.moves.urllib import parse as urlparse   # Retain Py2 compatibility for urlparse
+
+from .spec_cache import mark_used
+from .util import atomic_write
+
+
+def is_local(location):
+    """Tell whether ``location`` is a local path rather than a URL."""
+    parsed_url = urlparse.urlparse(location)
+    return not parsed_url.scheme or len(parsed_url.scheme) == 1  # Drive letters look like schemes
+
+
+class SpecFetcher(object):
+    """Fetches Swagger descriptions through one pooled HTTP session.
+
+    Responses carrying an ``ETag`` or ``Last-Modified`` header are kept in
+    ``directory`` and revalidated with a conditional request the next time
+    they are fetched. When the server answers ``304 Not Modified`` the stored
+    body is returned instead of downloading the description again.
+
+    The session, and with it ``requests``, is only created on the first remote
+    download, so builds that only read local files never import it.
+    """
+
+    RETRY_STATUSES = (500, 502, 503, 504)
+
+    def __init__(self, directory, timeout=None, retries=0, pool_size=10):
+        """
+        Args:
+            directory (str): Directory holding previous responses. Created on first write.
+            timeout: Timeout passed to requests, either seconds or a ``(connect, read)`` tuple
+            retries (int): Number of retries for failed connections and 5xx answers
+            pool_size (int): Number of connections kept alive per host
+        """
+        self.directory = directory
+        self.timeout = timeout
+        self.retries = retries
+        self.pool_size = pool_size
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The ``requests.Session`` shared by every download, created on first use."""
+        with self._lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests_file import FileAdapter
+
+        try:
+            from urllib3.util.retry import Retry
+        except ImportError:
+            from requests.packages.urllib3.util.retry import Retry
+
+        retry = Retry(total=self.retries, backoff_factor=0.5, status_forcelist=self.RETRY_STATUSES)
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.mount('file://', FileAdapter())
+        return session
+
+    def fetch(self, location):
+        """Return the raw contents at ``location``.
+
+        Args:
+            location (str): Absolute path or HTTP(S)/file URL
+
+        Returns:
+            bytes: The raw contents
+        """
+        return self.fetch_document(location)[0]
+
+    def fetch_document(self, location):
+        """Return the raw contents at ``location`` along with their content type.
+
+        Args:
+            location (str): Absolute path or HTTP(S)/file URL
+
+        Returns:
+            tuple: ``(content, content_type)``, the content type is ``None`` for local files
+        """
+        if is_local(location):
+            with open(location, 'rb') as fd:
+                return fd.read(), None
+
+        stored = self._load(location)
+        headers = {}
+        if stored is not None:
+            meta, body = stored
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        r = self.session.get(location, headers=headers, timeout=self.timeout)
+        if r.status_code == 304 and stored is not None:
+            meta, body = stored
+            return body, meta.get('content_type')
+
+        r.raise_for_status()
+        self._store(location, r)
+        return r.content, r.headers.get('Content-Type')
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+    def _load(self, url):
+        path = self._path(url)
+        try:
+            with open(path + '.json') as fd:
+                meta = json.load(fd)
+            with open(path + '.body', 'rb') as fd:
+                body = fd.read()
+        except (IOError, OSError, ValueError):
+            return None
+
+        if meta.get('url') != url:
+            return None
+
+        mark_used(path + '.body')
+        mark_used(path + '.json')
+        return meta, body
+
+    def _store(self, url, response):
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type'),
+        }
+        if not meta['etag'] and not meta['last_modified']:
+            return
+
+        # The body goes first, so a stored validator always has the matching body
+        path = self._path(url)
+        self._write(path + '.body', response.content)
+        self._write(path + '.json', json.dumps(meta).encode('utf-8'))
+
+    def _write(self, path, data):
+        with atomic_write(path) as fd:
+            fd.write(data)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import hashlib
+
+import six
+from sphinx.util import logging
+
+from .fragments import check_document
+from .loader import load_spec
+from .refs import join_location
+from .registry import get_registry
+from .util import per_doc_store
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(content):
+    """Return the fingerprint of the raw contents of a description."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def iter_external_refs(obj):
+    """Yield the location part of every ``$ref`` that points outside of ``obj``."""
+    pending = [obj]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            ref = value.get('$ref')
+            if isinstance(ref, six.string_types) and not ref.startswith('#'):
+                location = ref.split('#', 1)[0]
+                if location:
+                    yield location
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+
+
+def collect_sources(fetcher, location, content, document=None):
+    """Fingerprint a description and every file it transitively references.
+
+    Args:
+        fetcher (SpecFetcher): Fetcher used for the referenced files
+        location (str): Absolute path or URL of the description
+        content (bytes): Raw contents of the description
+        document: The description already parsed from ``content``, if available
+
+    Returns:
+        dict: Fingerprint of every source keyed by its location
+    """
+    sources = {location: fingerprint(content)}
+    if document is None:
+        document = load_spec(content, name=location)
+
+    pending = [(location, document)]
+    while pending:
+        base, document = pending.pop()
+        for ref in iter_external_refs(document):
+            target = join_location(base, ref)
+            if target in sources:
+                continue
+
+            content, content_type = fetcher.fetch_document(target)
+            sources[target] = fingerprint(content)
+            pending.append((target, load_spec(content, content_type, target)))
+
+    return sources
+
+
+def sources_changed(fetcher, sources, fingerprints=None):
+    """Tell whether any of ``sources`` no longer matches its recorded fingerprint.
+
+    Args:
+        fetcher (SpecFetcher): Fetcher used to read the current contents
+        sources (dict): Recorded fingerprints keyed by location
+        fingerprints (dict): Current fingerprints already computed, updated in place
+    """
+    if fingerprints is None:
+        fingerprints = {}
+
+    for location, recorded in sources.items():
+        if location not in fingerprints:
+            try:
+                fingerprints[location] = fingerprint(fetcher.fetch(location))
+            except Exception:
+                fingerprints[location] = None
+
+        if fingerprints[location] != recorded:
+            return True
+
+    return False
+
+
+def note_sources(env, sources):
+    """Record the sources the current document was generated from."""
+    per_doc_store(env, 'swaggerdoc_sources').setdefault(env.docname, {}).update(sources)
+
+
+def get_outdated(app, env, added, changed, removed):
+    """Return the documents whose descriptions changed since they were read."""
+    env = getattr(env, 'env', env)  # Sphinx before 2.0 passes the builder
+    fetcher = get_registry(env).fetcher
+    fingerprints = {}
+    outdated = []
+    unaffected = reused = rendered = 0
+    for docname, sources in per_doc_store(env, 'swaggerdoc_sources').items():
+        if docname in changed or docname in removed:
+            continue
+        if not sources_changed(fetcher, sources, fingerprints):
+            continue
+
+        # Only read the document again when a fragment it rendered changed
+        changed_locations = set(location for location in sources
+                                if sources_changed(fetcher, {location: sources[location]}, fingerprints))
+        current, doc_reused, doc_rendered = check_document(env, docname, changed_locations)
+        reused += doc_reused
+        rendered += doc_rendered
+        if current is None:
+            outdated.append(docname)
+        else:
+            sources.update(current)
+            unaffected += 1
+
+    if unaffected or reused or rendered:
+        logger.info('swaggerdoc: %d documents unaffected by description changes, %d outdated; '
+                    'fragments: %d unchanged, %d changed', unaffected, len(outdated), reused, rendered)
+
+    return outdated
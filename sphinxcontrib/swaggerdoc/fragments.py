@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+
+from .refs import make_ref, resolve_pointer
+from .registry import get_registry
+from .util import per_doc_store
+
+
+def fragment_hash(entry, pointer):
+    """Return the hash of the entry of a description a JSON pointer designates.
+
+    Operations, responses and definitions are the fragments a directive renders.
+    Hashes are computed once per loaded description.
+    """
+    try:
+        return entry.fragments[pointer]
+    except KeyError:
+        pass
+
+    try:
+        obj = resolve_pointer(entry.specification, pointer)
+    except (KeyError, IndexError, TypeError):
+        obj = None
+    serialized = json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str)
+    value = entry.fragments[pointer] = hashlib.sha256(serialized.encode('utf-8')).hexdigest()[:32]
+    return value
+
+
+def rendered_selection(entry, selected_tags, sections):
+    """Return the fragments a directive renders, in order and grouped by section.
+
+    Returns:
+        list: ``(group, pointers)`` for the section of each tag, empty ones
+        included, then for the Responses and Definitions sections, whose group
+        is their pointer, e.g. ``#/responses``
+    """
+    index = entry.index
+    selected, responses, definitions = index.select(entry.specification, selected_tags)
+
+    selection = []
+    if 'methods' in sections:
+        for tag_name, methods in selected:
+            selection.append((tag_name, [index.operation_pointer(path, method_type)
+                                         for path, method_type, method in methods]))
+    if 'responses' in sections:
+        selection.append(('#/responses', [make_ref('responses', name) for name in responses]))
+    if 'definitions' in sections:
+        selection.append(('#/definitions', [make_ref('definitions', name) for name in definitions]))
+    return selection
+
+
+def make_record(entry, selected_tags, sections):
+    """Describe what a directive rendered from ``entry``, to tell later whether its output changed.
+
+    The record holds the rendered fragments and the hash of each of them and of
+    every entry they reference, since inlined references are part of the output.
+    """
+    selection = rendered_selection(entry, selected_tags, sections)
+    pointers = [pointer for group, group_pointers in selection for pointer in group_pointers]
+    dependencies = set(pointers) | entry.index.reachable(pointers)
+    return {
+        'location': entry.location,
+        'tags': list(selected_tags),
+        'sections': list(sections),
+        'selection': selection,
+        'hashes': dict((pointer, fragment_hash(entry, pointer)) for pointer in dependencies),
+    }
+
+
+def note_fragments(env, record):
+    """Record what a directive of the current document rendered, ``None`` when it failed."""
+    per_doc_store(env, 'swaggerdoc_fragments').setdefault(env.docname, []).append(record)
+
+
+def check_document(env, docname, changed):
+    """Tell whether the output of a document survives changes to the descriptions it uses.
+
+    Every directive of the document reading one of the ``changed`` locations
+    is evaluated again against the description as it is now: the document is
+    unaffected when each of them would render the same fragments, with the
+    same contents, as when the document was read.
+
+    Args:
+        env (sphinx.environment.BuildEnvironment): Environment of the build
+        docname (str): Document whose sources changed
+        changed (set): Locations whose fingerprint changed
+
+    Returns:
+        tuple: ``(sources, reused, rendered)`` where ``sources`` maps the
+        locations read by the reloaded descriptions to their fingerprint, or is
+        ``None`` when the document must be read again, and the others count the
+        fragments whose hash did and did not match
+    """
+    # The directive module imports this one
+    from .swaggerv2_doc import SwaggerV2DocDirective
+
+    records = per_doc_store(env, 'swaggerdoc_fragments').get(docname)
+    if not records or None in records:
+        return None, 0, 0
+
+    registry = get_registry(env)
+    covered = set()
+    sources = {}
+    unchanged = True
+    reused = rendered = 0
+    for record in records:
+        location = record['location']
+        try:
+            entry = registry.get('swaggerv2doc', location,
+                                 lambda: SwaggerV2DocDirective.load_entry(registry, location))
+        except Exception:
+            return None, reused, rendered
+
+        record_sources = set(entry.sources)
+        covered.update(record_sources)
+        if not (changed & record_sources):
+            continue
+
+        current = make_record(entry, record['tags'], record['sections'])
+        for pointer, value in current['hashes'].items():
+            if record['hashes'].get(pointer) == value:
+                reused += 1
+            else:
+                rendered += 1
+        if current['selection'] != record['selection'] or current['hashes'] != record['hashes']:
+            unchanged = False
+        sources.update(entry.sources)
+
+    if not unchanged or not changed <= covered:
+        # Sources not covered are read by something else than a Swagger 2.0 directive
+        return None, reused, rendered
+
+    return sources, reused, rendered
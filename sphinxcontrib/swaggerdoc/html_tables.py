@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+import re
+import traceback
+
+import six
+from docutils import nodes
+from markupsafe import escape
+from sphinx import addnodes
+from sphinx.util import logging
+
+from .domain import ROLE_TYPES
+from .util import per_doc_store
+
+logger = logging.getLogger(__name__)
+
+# Renderers of the tables of a directive, see current_renderer
+NODES = 'nodes'
+HTML = 'html'
+
+# Same markup as the HTML5 translator of Sphinx 2 and later writes for the
+# node tables. Builders writing tables differently keep the node tables, see
+# tables_match.
+TABLE_TEMPLATE = u'''<table class="docutils align-default">
+<thead>
+<tr class="row-odd">{% for cell in head %}<th class="head">{{ cell }}</th>
+{% endfor %}</tr>
+</thead>
+<tbody>
+{% for row in body %}<tr class="row-{{ loop.cycle('even', 'odd') }}">{% for cell in row %}<td>{{ cell }}</td>
+{% endfor %}</tr>
+{% endfor %}</tbody>
+</table>
+'''
+
+# Cross-references are written as ``role``, ``target`` and ``text`` separated
+# by a control character and turned into links once every document has been
+# read, see resolve_xrefs. Unlike NUL, docutils keeps it in the text of nodes.
+XREF = u'\x1f{}\x1f{}\x1f{}\x1f'
+XREF_RE = re.compile(u'\x1f([^\x1f]*)\x1f([^\x1f]*)\x1f([^\x1f]*)\x1f')
+
+_template = None
+
+
+class swaggerdoc_table(nodes.General, nodes.Element):
+    """A table written as prebuilt HTML, see make_table.
+
+    The HTML is kept in the ``html`` attribute while the text of the cells is
+    the content of the node, so that the search index gets the same words as
+    from node tables without the entities of the HTML.
+    """
+
+
+def visit_swaggerdoc_table(translator, node):
+    translator.body.append(node['html'])
+    raise nodes.SkipNode
+
+
+def table_template():
+    """Return the template of the tables, compiling it on first use."""
+    global _template
+    if _template is None:
+        from jinja2 import Template
+        _template = Template(TABLE_TEMPLATE, autoescape=False, keep_trailing_newline=True)
+    return _template
+
+
+def node_html(node, alone=False):
+    """Write the HTML of the nodes the directive puts in table cells.
+
+    Args:
+        node (docutils.nodes.Node): Node to write
+        alone (bool): Whether the node is the only one of its cell, which
+            keeps the HTML5 translator from ending a paragraph with a newline
+    """
+    if isinstance(node, nodes.Text):
+        return escape(node)
+    if isinstance(node, swaggerdoc_table):
+        return node['html']
+    if isinstance(node, addnodes.pending_xref):
+        return XREF.format(node['reftype'], node['reftarget'], node.astext())
+
+    children = u''.join(node_html(child) for child in node.children)
+    if isinstance(node, nodes.paragraph):
+        return u'<p>{}</p>'.format(children) if alone else u'<p>{}</p>\n'.format(children)
+    if isinstance(node, nodes.strong):
+        return u'<strong>{}</strong>'.format(children)
+    if isinstance(node, nodes.container):
+        return u'<div class="docutils container">\n{}</div>\n'.format(children)
+    if isinstance(node, nodes.reference):
+        return u'<a class="reference internal" href="#{}">{}</a>'.format(escape(node['refid']), children)
+    return children
+
+
+def cell_html(contents):
+    """Write the HTML of a cell, see ``SwaggerV2DocDirective.cell``."""
+    if isinstance(contents, six.string_types):
+        return u'<p>{}</p>'.format(escape(contents))
+    if isinstance(contents, list):
+        return u''.join(node_html(node, len(contents) == 1) for node in contents)
+    return node_html(contents, True)
+
+
+def cell_text(contents):
+    """Return the words of a cell for the search index, see ``swaggerdoc_table``."""
+    if isinstance(contents, six.string_types):
+        return contents
+    words = []
+    for node in contents if isinstance(contents, list) else [contents]:
+        findall = getattr(node, 'findall', node.traverse)
+        words.extend(text.astext() for text in findall(nodes.Text))
+    return u' '.join(words)
+
+
+def make_table(head, body):
+    """Render a table as a ``swaggerdoc_table`` node.
+
+    Args:
+        head (list): Cells of the header row
+        body (list): Rows of cells. Cells are strings, nodes or lists of nodes.
+    """
+    html = table_template().render(head=[cell_html(cell) for cell in head],
+                                   body=[[cell_html(cell) for cell in row] for row in body])
+    text = u' '.join(cell_text(cell) for row in [head] + list(body) for cell in row)
+    node = swaggerdoc_table('', nodes.Text(text), html=html)
+    if u'\x1f' in html:
+        node['swaggerdoc_xrefs'] = True
+    return node
+
+
+def probe_cells():
+    """Return the header and rows of the table compared by ``tables_match``, with new nodes on each call."""
+    fields = [nodes.paragraph('', '', nodes.strong('', 'Fields')),
+              nodes.container('', nodes.paragraph('', 'nested <cell> & text'))]
+    return ['Name', 'Description'], [['id', 'The id'], ['name', fields], ['tags', 'The tags']]
+
+
+def write_html(builder, node):
+    """Return the HTML the translator of ``builder`` writes for ``node``."""
+    from sphinx.writers.html import HTMLWriter
+    from docutils.utils import new_document
+
+    writer = HTMLWriter(builder)
+    try:
+        from docutils.frontend import get_default_settings
+    except ImportError:  # docutils before 0.18
+        from docutils.frontend import OptionParser
+        settings = OptionParser(components=(writer,)).get_default_values()
+    else:
+        settings = get_default_settings(writer)
+
+    document = new_document('<swaggerdoc>', settings)
+    document += node
+    translator = builder.create_translator(document, builder)
+    node.walkabout(translator)
+    return u''.join(translator.body)
+
+
+def tables_match(builder):
+    """Tell whether ``builder`` writes node tables with the markup of ``TABLE_TEMPLATE``."""
+    # The directive module imports this one
+    from .swaggerv2_doc import SwaggerV2DocDirective
+
+    directive = SwaggerV2DocDirective.__new__(SwaggerV2DocDirective)
+    directive.html_tables = False
+    directive._nodes = 0
+    try:
+        expected = write_html(builder, directive.create_table(*probe_cells()))
+    except Exception:
+        logger.verbose(traceback.format_exc())
+        return False
+    return expected == make_table(*probe_cells())['html']
+
+
+def init_renderer(app):
+    """Pick the renderer of the build, tables are written as HTML for HTML builders when enabled.
+
+    HTML tables are only used when the builder writes node tables with the
+    same markup, the HTML4 translator and older Sphinx versions do not.
+    """
+    html = app.config.swaggerdoc_html_tables and app.builder.format == 'html'
+    if html and not tables_match(app.builder):
+        logger.info('swaggerdoc: swaggerdoc_html_tables is ignored, the %s builder writes tables '
+                    'with other markup', app.builder.name)
+        html = False
+    app.env.swaggerdoc_renderer = HTML if html else NODES
+
+
+def current_renderer(env):
+    return getattr(env, 'swaggerdoc_renderer', NODES)
+
+
+def note_renderer(env):
+    """Record the renderer of the tables of the current document."""
+    per_doc_store(env, 'swaggerdoc_renderers')[env.docname] = current_renderer(env)
+
+
+def get_outdated(app, env, added, changed, removed):
+    """Read the documents whose tables were rendered for another kind of builder again."""
+    env = getattr(env, 'env', env)  # Sphinx before 2.0 passes the builder
+    renderer = current_renderer(env)
+    return [docname for docname, used in per_doc_store(env, 'swaggerdoc_renderers').items()
+            if used != renderer and docname not in removed]
+
+
+def resolve_xrefs(app, doctree, docname):
+    """Turn the cross-references of the HTML tables of a document into links."""
+    domain = app.env.get_domain('swagger')
+
+    def link(match):
+        role, target, text = match.groups()
+        found = domain.find_object(ROLE_TYPES[role], target)
+        if not found:
+            logger.warning(domain.dangling_warnings[role], {'target': target}, location=docname,
+                           type='ref', subtype=role)
+            return escape(text)
+
+        todocname, node_id = found
+        uri = '' if todocname == docname else app.builder.get_relative_uri(docname, todocname)
+        return u'<a class="reference internal" href="{}#{}" title="{}">{}</a>'.format(
+            escape(uri), escape(node_id), escape(target), escape(text))
+
+    findall = getattr(doctree, 'findall', doctree.traverse)
+    for node in findall(swaggerdoc_table):
+        if node.get('swaggerdoc_xrefs'):
+            node['html'] = XREF_RE.sub(link, node['html'])
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+
+from .refs import iter_refs, make_ref
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch')
+
+# Tag operations without tags are grouped under
+DEFAULT_GROUP = ''
+
+# Title and section id of the operations without tags
+UNTAGGED_TITLE = 'Other operations'
+UNTAGGED_ID = 'untagged'
+
+
+class SpecIndex(object):
+    """Lookup tables of a Swagger 2.0 specification, built once when it is loaded.
+
+    Operations and entries of ``definitions``, ``responses`` and ``parameters``
+    are identified by their JSON pointer, e.g. ``#/paths/~1pet/get`` or
+    ``#/definitions/Pet``.
+
+    Attributes:
+        tags (OrderedDict): Tag name to list of ``(path, method_type, method)``,
+            declared tags first, operations without tags under ``DEFAULT_GROUP``
+        operations (dict): operationId to ``(path, method_type, method)``
+        pointers (dict): Pointer of each operation to ``(path, method_type, method)``
+        dependencies (dict): Pointer to the set of pointers it references directly
+        referrers (dict): Pointer to the set of pointers referencing it directly
+    """
+
+    def __init__(self, specification):
+        self.tags = OrderedDict()
+        self.operations = {}
+        self.pointers = {}
+        self.dependencies = {}
+        self.referrers = {}
+
+        for tag in specification.get('tags', []):
+            self.tags[tag['name']] = []
+
+        for path, methods in specification.get('paths', {}).items():
+            for method_type, method in methods.items():
+                if method_type not in HTTP_METHODS:
+                    continue
+
+                operation = (path, method_type, method)
+                pointer = self.operation_pointer(path, method_type)
+                self.pointers[pointer] = operation
+                if 'operationId' in method:
+                    self.operations[method['operationId']] = operation
+
+                for tag in method.get('tags') or [DEFAULT_GROUP]:
+                    self.tags.setdefault(tag, []).append(operation)
+
+                self._add_dependencies(pointer, method)
+                if 'parameters' in methods:  # Parameters shared by every operation of the path
+                    self._add_dependencies(pointer, methods['parameters'])
+
+        for section in ('definitions', 'responses', 'parameters'):
+            for name, obj in specification.get(section, {}).items():
+                self._add_dependencies(make_ref(section, name), obj)
+
+        if len(self.tags) == 0:
+            self.tags[DEFAULT_GROUP] = []
+
+    def _add_dependencies(self, pointer, obj):
+        dependencies = self.dependencies.setdefault(pointer, set())
+        for ref in iter_refs(obj):
+            ref = '/'.join(ref.split('/')[:3])  # Pointers into an entry depend on the whole entry
+            dependencies.add(ref)
+            self.referrers.setdefault(ref, set()).add(pointer)
+
+    def reachable(self, pointers):
+        """Return every pointer transitively referenced from ``pointers``."""
+        seen = set()
+        pending = list(pointers)
+        while pending:
+            for ref in self.dependencies.get(pending.pop(), ()):
+                if ref not in seen:
+                    seen.add(ref)
+                    pending.append(ref)
+
+        return seen
+
+    def select(self, specification, selected_tags):
+        """Return what a directive documenting ``selected_tags`` renders.
+
+        Args:
+            specification (dict): The specification this index was built from
+            selected_tags (list): Tags to document, every tag when empty
+
+        Returns:
+            tuple: ``(selected, responses, definitions)`` where ``selected`` lists
+            ``(tag_name, methods)`` and the others map names to the entries the
+            selected operations can reach, every entry when no tag is selected
+        """
+        selected = [(tag_name, methods) for tag_name, methods in self.tags.items()
+                    if tag_name in selected_tags or len(selected_tags) == 0]
+
+        responses = specification.get('responses', {})
+        definitions = specification.get('definitions', {})
+        if len(selected_tags) > 0:
+            # Only emit what the selected operations can reach
+            reached = self.reachable(self.operation_pointer(path, method_type)
+                                     for tag_name, methods in selected
+                                     for path, method_type, method in methods)
+            responses = dict((name, response) for name, response in responses.items()
+                             if make_ref('responses', name) in reached)
+            definitions = dict((name, definition) for name, definition in definitions.items()
+                               if make_ref('definitions', name) in reached)
+
+        return selected, responses, definitions
+
+    def operation_pointer(self, path, method_type):
+        return make_ref('paths', path) + '/' + method_type
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import os
+
+try:
+    import orjson as _json
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
+
+JSON_EXTENSIONS = ('.json',)
+YAML_EXTENSIONS = ('.yaml', '.yml')
+
+
+def sniff_format(content, content_type=None, name=None):
+    """Guess whether raw contents are JSON or YAML.
+
+    The content type wins over the file extension, which wins over the first
+    significant byte of the contents.
+
+    Args:
+        content (bytes): Raw contents
+        content_type (str): Content type announced by the server, if any
+        name (str): Path or URL the contents were read from, if any
+
+    Returns:
+        str: ``'json'`` or ``'yaml'``
+    """
+    if content_type:
+        content_type = content_type.lower()
+        if 'json' in content_type:
+            return 'json'
+        if 'yaml' in content_type:
+            return 'yaml'
+
+    if name:
+        extension = os.path.splitext(name.split('?', 1)[0])[1].lower()
+        if extension in JSON_EXTENSIONS:
+            return 'json'
+        if extension in YAML_EXTENSIONS:
+            return 'yaml'
+
+    start = content.lstrip(b'\xef\xbb\xbf \t\r\n')[:1]
+    return 'json' if start in (b'{', b'[') else 'yaml'
+
+
+def load_json(content):
+    if _json.__name__ == 'json' and isinstance(content, bytes):
+        # The standard library only parses bytes from Python 3.6 on
+        content = content.decode('utf-8-sig')
+    return _json.loads(content)
+
+
+def yaml_loader():
+    """Return the YAML loader class, importing PyYAML on first use."""
+    try:
+        from yaml import CSafeLoader as SafeLoader  # libyaml bindings
+    except ImportError:
+        from yaml import SafeLoader
+    return SafeLoader
+
+
+def load_yaml(content):
+    import yaml
+    return yaml.load(content, Loader=yaml_loader())
+
+
+def load_spec(content, content_type=None, name=None):
+    """Parse the raw contents of a description with the fastest suitable parser.
+
+    Args:
+        content (bytes): Raw contents
+        content_type (str): Content type announced by the server, if any
+        name (str): Path or URL the contents were read from, if any
+
+    Returns:
+        The parsed contents
+    """
+    if sniff_format(content, content_type, name) == 'json':
+        try:
+            return load_json(content)
+        except ValueError:
+            pass  # Mislabelled YAML, which is a superset of JSON anyway
+
+    return load_yaml(content)
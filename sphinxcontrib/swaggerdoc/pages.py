@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import re
+
+from sphinx.util import logging
+
+from .fetch import is_local
+from .index import DEFAULT_GROUP, UNTAGGED_ID, UNTAGGED_TITLE
+from .registry import get_registry
+from .swaggerv2_doc import SwaggerV2DocDirective
+
+logger = logging.getLogger(__name__)
+
+# Lists the pages generated in a directory, see remove_stale_pages
+MANIFEST = '.swaggerdoc-pages'
+
+
+def slugify(name):
+    return re.sub(r'[^\w.-]+', '-', name, flags=re.UNICODE).strip('-').lower()
+
+
+def heading(title, char='='):
+    return u'{}\n{}\n'.format(title, char * len(title))
+
+
+def directive(location, spec_name, sections, tags=(), untagged=False):
+    lines = [u'.. swaggerv2doc::', u'   :spec-name: ' + spec_name, u'   :sections: ' + sections]
+    if untagged:
+        lines.append(u'   :untagged:')
+    lines.append(u'')
+    lines.append(u'   ' + location)
+    lines.extend(u'   ' + tag for tag in tags)
+    return u'\n'.join(lines) + u'\n'
+
+
+def write_if_changed(path, content):
+    """Write ``content`` to ``path`` unless it already holds it, so Sphinx does not see the page as changed."""
+    try:
+        with io.open(path, encoding='utf-8') as fd:
+            if fd.read() == content:
+                return
+    except (IOError, OSError):
+        pass
+
+    with io.open(path, 'w', encoding='utf-8') as fd:
+        fd.write(content)
+
+
+def remove_stale_pages(target, names):
+    """Remove the pages generated in ``target`` by a previous build that are no longer generated.
+
+    Args:
+        target (str): Directory of the pages
+        names (list): Names, without extension, of the pages generated now
+    """
+    manifest = os.path.join(target, MANIFEST)
+    try:
+        with io.open(manifest, encoding='utf-8') as fd:
+            previous = fd.read().split()
+    except (IOError, OSError):
+        previous = []
+
+    for name in set(previous) - set(names):
+        path = os.path.join(target, *name.split('/')) + '.rst'
+        if os.path.exists(path):
+            os.remove(path)
+            logger.verbose('removed stale page %s', path)
+
+    write_if_changed(manifest, u''.join(u'{}\n'.format(name) for name in sorted(names)))
+
+
+def spec_pages(directory, source, specification, index):
+    """Return ``{docname: content}`` of the stub documents of one description.
+
+    Args:
+        directory (str): Directory of the pages, relative to the source directory
+        source (str): Location of the description as written in the pages
+        specification (dict): The loaded description
+        index (SpecIndex): Index of the description
+    """
+    descriptions = dict((tag.get('name'), tag.get('description', '')) for tag in specification.get('tags', []))
+    title = specification.get('info', {}).get('title') or directory
+    spec_name = directory
+
+    pages = {}
+    toctree = []
+    slugs = set()
+    for tag, methods in index.tags.items():
+        if not methods:
+            continue
+
+        slug = slugify(tag) or UNTAGGED_ID
+        while slug in slugs or slug in ('index', 'definitions', 'responses'):
+            slug += '-'
+        slugs.add(slug)
+
+        if tag == DEFAULT_GROUP:
+            content = heading(UNTAGGED_TITLE) + u'\n' + directive(source, spec_name, 'methods', untagged=True)
+        else:
+            content = heading(tag) + u'\n'
+            if descriptions.get(tag):
+                content += descriptions[tag] + u'\n\n'
+            content += directive(source, spec_name, 'methods', [tag])
+
+        pages[slug] = content
+        toctree.append(slug)
+
+    for section in ('responses', 'definitions'):
+        if specification.get(section):
+            pages[section] = heading(section.capitalize()) + u'\n' + directive(source, spec_name, section)
+            toctree.append(section)
+
+    pages['index'] = (heading(title) + u'\n.. toctree::\n   :maxdepth: 1\n\n' +
+                      u''.join(u'   {}\n'.format(docname) for docname in toctree))
+
+    return dict((directory + '/' + docname, content) for docname, content in pages.items())
+
+
+def generate_pages(app):
+    """Write one page per tag, plus Responses and Definitions pages, for each description of ``swaggerdoc_pages``.
+
+    ``swaggerdoc_pages`` maps a directory of the documentation, e.g. ``api/pets``,
+    to the path (relative to the source directory) or URL of a Swagger 2.0
+    description. The directory gets an ``index`` page listing the generated
+    ones. Pages are only rewritten when their content changes, so unchanged
+    pages are not read again on incremental builds. Pages generated by a
+    previous build for tags that no longer exist are removed.
+    """
+    env = app.env
+    registry = get_registry(env)
+
+    for directory, url in sorted(app.config.swaggerdoc_pages.items()):
+        directory = directory.strip('/')
+        if is_local(url):
+            location = os.path.join(str(app.srcdir), url)
+            source = '/' + url.lstrip('/').replace(os.sep, '/')
+        else:
+            location = source = url
+
+        try:
+            entry = registry.get('swaggerv2doc', location,
+                                 lambda: SwaggerV2DocDirective.load_entry(registry, location))
+        except Exception as e:
+            logger.warning('Unable to generate pages of %s: %s', url, e)
+            continue
+
+        pages = spec_pages(directory, source, entry.specification, entry.index)
+
+        target = os.path.join(str(app.srcdir), *directory.split('/'))
+        if not os.path.isdir(target):
+            os.makedirs(target)
+        for docname, content in sorted(pages.items()):
+            write_if_changed(os.path.join(str(app.srcdir), *docname.split('/')) + '.rst', content)
+        remove_stale_pages(target, [docname[len(directory) + 1:] for docname in pages])
+
+        logger.verbose('generated %d pages for %s in %s', len(pages), url, directory)
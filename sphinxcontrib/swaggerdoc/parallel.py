@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import gc
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+# ProcessPoolExecutor takes an initializer from Python 3.7 on
+POOL_SUPPORTED = sys.version_info >= (3, 7)
+
+# Fewest entries sent to a worker at once, smaller sections are rendered in process
+MIN_CHUNK = 32
+
+# Chunks per worker, so that workers done early pick up more of the remaining ones
+CHUNKS_PER_WORKER = 4
+
+# Rendering state copied into the workers, see SwaggerV2DocDirective.render
+STATE = ('inline', 'max_depth', 'max_properties', 'max_nodes', 'spec_name', 'refdoc', 'html_tables')
+
+_directive = None
+
+# Set once creating a pool failed, sections are then rendered in process
+_pool_failed = False
+
+
+def _init_worker(cls, specification, state):
+    global _directive
+    # Workers only render, whatever they allocate goes away with them
+    gc.disable()
+    directive = cls.__new__(cls)
+    directive.api_desc = specification
+    for name, value in state.items():
+        setattr(directive, name, value)
+    _directive = directive
+
+
+def _render_chunk(section, names):
+    make = _directive.make_response if section == 'responses' else _directive.make_definition
+    entries = _directive.api_desc[section]
+    return [make(name, entries[name]) for name in names]
+
+
+def check_config(app):
+    """Warn that ``swaggerdoc_render_workers`` is ignored when this Python cannot start the pool."""
+    if app.config.swaggerdoc_render_workers > 1 and not POOL_SUPPORTED:
+        logger.warning('swaggerdoc_render_workers needs Python 3.7 or later, sections are rendered serially')
+
+
+def make_chunks(names, workers):
+    """Split ``names`` into consecutive chunks for ``workers`` processes, ``[]`` when not worth it."""
+    size = max(MIN_CHUNK, -(-len(names) // (workers * CHUNKS_PER_WORKER)))
+    if len(names) <= size:
+        return []
+    return [names[start:start + size] for start in range(0, len(names), size)]
+
+
+def render_parallel(directive, section, names, workers):
+    """Render entries of the ``responses`` or ``definitions`` of a directive in a process pool.
+
+    Entries only depend on the specification and on the rendering options, so
+    each worker renders consecutive chunks of them from its own copy of the
+    specification. The returned sections are in the order of ``names`` and
+    equal to the ones the directive renders itself; the node budget of
+    ``max_nodes`` is shared by the whole directive, so it must be disabled.
+    Unpickling the results allocates as many nodes as rendering them, so call
+    it with the garbage collector paused as well, see ``paused_gc``.
+
+    Args:
+        directive (SwaggerV2DocDirective): Directive being rendered
+        section (str): ``responses`` or ``definitions``
+        names (list): Names of the entries of ``section`` to render
+        workers (int): Number of processes
+
+    Returns:
+        list: The section of each entry, ``None`` when there are too few
+        entries for a pool to pay off or no pool can be started
+    """
+    global _pool_failed
+    chunks = make_chunks(names, workers)
+    if not chunks or not POOL_SUPPORTED or _pool_failed:
+        return None
+
+    state = dict((name, getattr(directive, name)) for name in STATE)
+    # Workers are forked where possible, so the specification is not copied
+    try:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_worker,
+                                       initargs=(type(directive), directive.api_desc, state))
+    except (ImportError, NotImplementedError, OSError) as e:
+        # Platforms without working semaphores cannot run a pool
+        _pool_failed = True
+        logger.warning('Unable to start swaggerdoc_render_workers, sections are rendered serially: %s', e)
+        return None
+
+    try:
+        results = executor.map(_render_chunk, [section] * len(chunks), chunks)
+        return [entry for chunk in results for entry in chunk]
+    finally:
+        executor.shutdown()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import glob
+import io
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from .aggregate import GLOB_CHARS
+from .fetch import is_local
+from .registry import get_registry
+from .swagger_doc import SwaggerDocDirective
+from .swaggerv2_doc import SwaggerV2DocDirective
+
+DIRECTIVE_RE = re.compile(r'^(\s*)\.\.\s+(swaggerdoc|swaggerv2doc|swaggerv2aggregate)::(.*)$')
+
+# Kind of registry entry each directive loads its descriptions into
+KINDS = {
+    'swaggerdoc': 'swaggerdoc',
+    'swaggerv2doc': 'swaggerv2doc',
+    'swaggerv2aggregate': 'swaggerv2doc',
+}
+
+# How each kind of description is loaded into the registry
+LOADERS = {
+    'swaggerdoc': SwaggerDocDirective.load_entry,
+    'swaggerv2doc': SwaggerV2DocDirective.load_entry,
+}
+
+
+def directive_content(lines, start, indent):
+    """Return the stripped content lines of the directive whose marker is ``lines[start]``, options excluded."""
+    content = []
+    for line in lines[start + 1:]:
+        if not line.strip():
+            continue
+        if len(line) - len(line.lstrip()) <= indent:
+            break
+        if not content and line.strip().startswith(':'):
+            continue
+        content.append(line.strip())
+    return content
+
+
+def find_sources(lines):
+    """Yield ``(directive, url)`` for every Swagger directive in a reST source.
+
+    The URL of ``swaggerv2doc`` is part of its content and may be given on
+    the line following the directive marker, after the directive options.
+    Every line of the content of ``swaggerv2aggregate`` is a URL, possibly a
+    glob pattern.
+    """
+    lines = list(lines)
+    for number, line in enumerate(lines):
+        match = DIRECTIVE_RE.match(line)
+        if match is None:
+            continue
+
+        indent, name, url = len(match.group(1)), match.group(2), match.group(3).strip()
+        urls = [url] if url else []
+        if name != 'swaggerdoc':
+            urls.extend(directive_content(lines, number, indent))
+        if name == 'swaggerv2doc':
+            urls = urls[:1]  # The other lines are tags
+
+        for url in urls:
+            yield name, url
+
+
+def prefetch_specs(app, env, docnames):
+    """Load every description referenced by the documents about to be read.
+
+    Distinct descriptions are fetched and parsed concurrently, so directives
+    find them already in the registry. Failures are ignored here; the
+    directive loads the description again and reports the error in place.
+    """
+    workers = env.config.swaggerdoc_prefetch_workers
+    if not workers:
+        return
+
+    registry = get_registry(env)
+    sources = {}
+    for docname in docnames:
+        try:
+            with io.open(str(env.doc2path(docname)), encoding=env.config.source_encoding) as fd:
+                found = list(find_sources(fd))
+        except (IOError, OSError, UnicodeDecodeError):
+            continue
+
+        for name, url in found:
+            if not is_local(url):
+                locations = [url]
+            elif name == 'swaggerv2aggregate' and any(char in url for char in GLOB_CHARS):
+                locations = glob.glob(env.relfn2path(url, docname)[1])
+            else:
+                locations = [env.relfn2path(url, docname)[1]]
+
+            for location in locations:
+                sources[(KINDS[name], location)] = LOADERS[KINDS[name]]
+
+    if not sources:
+        return
+
+    def load(source):
+        name, location = source
+        try:
+            registry.get(name, location, lambda: sources[source](registry, location))
+        except Exception:
+            pass
+
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(sources)))
+    try:
+        list(executor.map(load, sources))
+    finally:
+        executor.shutdown()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import os
+
+import six
+from six.moves.urllib import parse as urlparse   # Retain Py2 compatibility for urlparse
+
+from .fetch import is_local
+
+
+def is_internal(ref):
+    return isinstance(ref, six.string_types) and ref.startswith('#/')
+
+
+def make_ref(section, name):
+    """Build the internal ``$ref`` of an entry, e.g. ``make_ref('definitions', 'Pet')``."""
+    return '#/{}/{}'.format(section, name.replace('~', '~0').replace('/', '~1'))
+
+
+def resolve_pointer(specification, ref):
+    """Return the object an internal ``$ref`` such as ``#/definitions/Pet`` points to."""
+    target = specification
+    for part in ref[2:].split('/'):
+        target = target[part.replace('~1', '/').replace('~0', '~')]
+    return target
+
+
+def iter_refs(obj):
+    """Yield every internal ``$ref`` found in ``obj`` without following them."""
+    pending = [obj]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            ref = value.get('$ref')
+            if is_internal(ref):
+                yield ref
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+
+
+def join_location(base, ref):
+    """Resolve the location part of an external ``$ref`` against the file it appears in."""
+    if not is_local(ref):
+        return ref
+
+    if is_local(base):
+        return os.path.normpath(os.path.join(os.path.dirname(base), ref))
+
+    return urlparse.urljoin(base, ref)
+
+
+def absolute_refs(obj, base):
+    """Return a copy of ``obj`` whose external references are absolute.
+
+    Args:
+        obj: Object to rewrite, left untouched
+        base (str): Path or URL of the file ``obj`` was read from
+    """
+    if isinstance(obj, dict):
+        obj = dict((key, absolute_refs(value, base)) for key, value in obj.items())
+        ref = obj.get('$ref')
+        if isinstance(ref, six.string_types) and not ref.startswith('#'):
+            location, _, fragment = ref.partition('#')
+            if location:
+                obj['$ref'] = join_location(base, location) + ('#' + fragment if fragment else '')
+        return obj
+
+    if isinstance(obj, list):
+        return [absolute_refs(value, base) for value in obj]
+
+    return obj
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import weakref
+
+from six.moves.urllib import parse as urlparse   # Retain Py2 compatibility for urlparse
+
+from .fetch import SpecFetcher, is_local
+from .spec_cache import SpecCache
+from .validation import ValidationCache
+
+
+class SpecEntry(object):
+    """A Swagger description loaded once per build.
+
+    The same entry is handed to every directive referring to the description,
+    so its contents must be treated as read-only.
+    """
+
+    def __init__(self, location, specification, index=None, sources=None, timings=None):
+        """
+        Args:
+            location (str): Absolute path or URL of the description
+            specification (dict): The parsed description
+            index (SpecIndex): Lookup tables of a Swagger 2.0 specification
+            sources (dict): Fingerprints of the description and the files it references, by location
+            timings (dict): Seconds spent in each stage of loading the description
+        """
+        self.location = location
+        self.specification = specification
+        self.index = index
+        self.sources = sources or {}
+        self.timings = timings or {}
+        self.fragments = {}  # Hash of each rendered fragment by pointer, see fragments.fragment_hash
+
+
+class SpecRegistry(object):
+    """Build-wide registry of loaded Swagger descriptions.
+
+    Entries are keyed by the kind of description and its normalized URL. Each
+    entry is loaded once, even when several threads ask for it concurrently,
+    and kept until ``release`` is called. Descriptions that passed validation
+    are recorded next to the cache.
+    """
+
+    def __init__(self, config, cache, fetcher):
+        """
+        Args:
+            config (sphinx.config.Config): Configuration of the build
+            cache (SpecCache): On-disk cache of resolved specifications
+            fetcher (SpecFetcher): Fetcher shared by every download of the build
+        """
+        self.config = config
+        self.cache = cache
+        self.fetcher = fetcher
+        self.validated = ValidationCache(os.path.join(cache.directory, 'validated'), cache.enabled)
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind, location, factory):
+        """Return the entry for ``location``, loading it with ``factory`` on first use.
+
+        Args:
+            kind (str): Kind of description, e.g. the name of the directive loading it
+            location (str): Absolute path or URL of the description
+            factory (callable): Called without arguments to build the entry
+
+        Returns:
+            The value returned by ``factory``
+        """
+        key = (kind, normalize_url(location))
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads the entry, the others wait for it
+        with lock:
+            with self._lock:
+                if key in self._entries:
+                    return self._entries[key]
+
+            entry = factory()
+            with self._lock:
+                self._entries[key] = entry
+
+        return entry
+
+    def release(self):
+        """Drop every loaded entry, later calls to ``get`` load them again."""
+        with self._lock:
+            self._entries.clear()
+            self._locks.clear()
+
+
+def normalize_url(url):
+    """Normalize a URL or absolute path so that equivalent spellings compare equal."""
+    if is_local(url):
+        return os.path.normcase(os.path.normpath(url))
+
+    parsed_url = urlparse.urlsplit(url)
+    return urlparse.urlunsplit((
+        parsed_url.scheme.lower(),
+        parsed_url.netloc.lower(),
+        parsed_url.path or '/',
+        parsed_url.query,
+        ''
+    ))
+
+
+_registries = weakref.WeakKeyDictionary()
+
+
+def get_registry(env):
+    """Return the registry of the build ``env`` belongs to, creating it on first use.
+
+    The registry is kept outside of the environment so the loaded descriptions
+    are never pickled along with it.
+    """
+    try:
+        return _registries[env]
+    except KeyError:
+        pass
+
+    directory = env.config.swaggerdoc_cache_dir
+    if directory is None:
+        directory = os.path.join(env.doctreedir, 'swaggerdoc')
+    cache = SpecCache(directory, env.config.swaggerdoc_cache_max_size)
+    fetcher = SpecFetcher(os.path.join(directory, 'http'),
+                          timeout=env.config.swaggerdoc_http_timeout,
+                          retries=env.config.swaggerdoc_http_retries)
+
+    return _registries.setdefault(env, SpecRegistry(env.config, cache, fetcher))
+
+
+def release_descriptions(app, env):
+    """Release the descriptions loaded while reading, writing the pages does not need them."""
+    registry = _registries.get(env)
+    if registry is not None:
+        registry.release()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import pickle
+
+from .util import atomic_write
+
+# Smallest amount of disk a file takes, so that empty files count as well
+BLOCK_SIZE = 4096
+
+
+def mark_used(path):
+    """Update the modification time of a cache file so eviction keeps it around."""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+class SpecCache(object):
+    """On-disk store of resolved Swagger specifications.
+
+    Entries are pickled into ``directory`` under a hash of the raw spec they
+    were resolved from, so a spec that has not changed since the previous
+    build is loaded without going through prance again. When the directory
+    grows past ``max_size`` bytes the least recently used entries are removed.
+    Everything stored under ``directory`` counts, including the downloads of
+    ``SpecFetcher`` and the markers of ``ValidationCache`` kept next to the
+    resolved specifications.
+    """
+
+    # Bump whenever the layout of the cached values changes
+    VERSION = '4'
+    SUFFIX = '.pickle'
+
+    # Files of the cache, those of SpecFetcher and ValidationCache included
+    ENTRY_SUFFIXES = (SUFFIX, '.body', '.json', '.valid')
+
+    def __init__(self, directory, max_size=None):
+        """
+        Args:
+            directory (str): Directory holding the cache entries. Created on first write.
+            max_size (int): Upper bound for the total size of the entries in bytes.
+                ``None`` keeps every entry, ``0`` disables the cache.
+        """
+        self.directory = directory
+        self.max_size = max_size
+
+    @property
+    def enabled(self):
+        return self.max_size != 0
+
+    @classmethod
+    def content_key(cls, content, *extra):
+        """Compute the cache key of a raw spec.
+
+        Args:
+            content (bytes): Raw bytes of the spec as fetched.
+            extra (str): Additional values the cached result depends on, e.g. the
+                location relative references are resolved against.
+
+        Returns:
+            str: Hex digest identifying the entry
+        """
+        digest = hashlib.sha256()
+        digest.update(cls.VERSION.encode('utf-8'))
+        for value in extra:
+            digest.update(b'\0')
+            digest.update(value.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content)
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key):
+        """Return the value stored under ``key`` or ``None`` on a miss."""
+        if not self.enabled:
+            return None
+
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as fd:
+                value = pickle.load(fd)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        mark_used(path)
+        return value
+
+    def put(self, key, value):
+        """Store ``value`` under ``key`` and evict old entries if needed.
+
+        The entry is written to a temporary file first and renamed into place,
+        so concurrent builds never read a partially written entry.
+        """
+        if not self.enabled:
+            return
+
+        with atomic_write(self.path(key)) as fd:
+            pickle.dump(value, fd, pickle.HIGHEST_PROTOCOL)
+
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in ``max_size``.
+
+        Files of the directory tree sharing a name but for their extension,
+        e.g. a stored download and its metadata, are a single entry.
+        """
+        if self.max_size is None or not os.path.isdir(self.directory):
+            return
+
+        entries = {}
+        total = 0
+        for root, dirnames, filenames in os.walk(self.directory):
+            for name in filenames:
+                stem, suffix = os.path.splitext(os.path.join(root, name))
+                if suffix not in self.ENTRY_SUFFIXES:
+                    continue
+                try:
+                    stat = os.stat(stem + suffix)
+                except OSError:
+                    continue
+                size = max(stat.st_size, BLOCK_SIZE)
+                mtime, entry_size, paths = entries.get(stem, (0, 0, ()))
+                entries[stem] = (max(mtime, stat.st_mtime), entry_size + size, paths + (stem + suffix,))
+                total += size
+
+        for mtime, size, paths in sorted(entries.values()):
+            if total <= self.max_size:
+                break
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+            total -= size
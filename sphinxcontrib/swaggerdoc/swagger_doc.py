@@ -1,16 +1,23 @@
 # -*- coding: utf-8 -*-
 from docutils import nodes
 from docutils.parsers.rst import Directive, roles, directives
-from sphinxcontrib.httpdomain import HTTPGet
 import traceback
 import os
+from concurrent.futures import ThreadPoolExecutor
 from sphinx.errors import SphinxError
+from sphinx.util import logging
 
 from sphinx.locale import _
 
 from six.moves.urllib import parse as urlparse   # Retain Py2 compatibility for urlparse
-import requests
-import json
+
+from .fetch import is_local
+from .fingerprint import fingerprint, note_sources
+from .loader import load_json
+from .registry import SpecEntry, get_registry
+from .timing import DirectiveTiming, timed
+
+logger = logging.getLogger(__name__)
 
 
 class SwaggerDocDirective(Directive):
@@ -29,27 +36,82 @@ class SwaggerDocDirective(Directive):
             url (str): HTTP(S) URL or relative/absolute path in the sphinx source folder.
 
         Returns:
-              dict: Containing the contents of the resource listing
+              SpecEntry: Whose specification contains the resource listing
         """
         parsed_url = urlparse.urlparse(url)
-        
+        env = self.state.document.settings.env
+
         if not parsed_url.scheme:  # Assume file relative to documentation
-            env = self.state.document.settings.env
             relfn, absfn = env.relfn2path(url)
 
             if not os.path.exists(absfn):
                 raise self.error("File not found: %s" % absfn)
 
             env.note_dependency(relfn)
+            location = absfn
+        else:
+            location = url
 
-            with open(absfn) as fd:
-                content = fd.read()
+        registry = get_registry(env)
+        entry = registry.get('swaggerdoc', location, lambda: self.load_entry(registry, location))
+        note_sources(env, entry.sources)
 
-            return json.loads(content)
-        else:
-            s = requests.Session()
-            r = s.get(url)
-            return r.json()
+        return entry
+
+    @staticmethod
+    def is_resource_listing(document):
+        """Whether ``document`` is a `Resource Listing`_ rather than an API Declaration."""
+        return 'resourcePath' not in document and all('operations' not in api for api in document.get('apis', []))
+
+    @staticmethod
+    def declaration_location(listing, path):
+        """Return the location of the API Declaration listed under ``path`` in the listing at ``listing``."""
+        path = path.replace('{format}', 'json')
+        if is_local(listing):
+            return os.path.join(os.path.dirname(listing), *path.lstrip('/').split('/'))
+
+        return listing.rstrip('/') + path
+
+    def load_declarations(self, listing):
+        """Load every API Declaration of a Resource Listing concurrently.
+
+        Declarations are fetched through the shared connection pool of the
+        build. A declaration that fails to load does not affect the others.
+
+        Args:
+            listing (SpecEntry): Entry of the Resource Listing
+
+        Returns:
+            list: ``(location, entry)`` for each declaration, in listing order,
+            where ``entry`` is the exception raised if it failed to load
+        """
+        registry = get_registry(self.state.document.settings.env)
+        locations = [self.declaration_location(listing.location, api['path'])
+                     for api in listing.specification.get('apis', [])]
+        if not locations:
+            return []
+
+        def load(location):
+            try:
+                return registry.get('swaggerdoc', location, lambda: self.load_entry(registry, location))
+            except Exception as e:
+                return e
+
+        workers = registry.config.swaggerdoc_prefetch_workers or 1
+        executor = ThreadPoolExecutor(max_workers=min(workers, len(locations)))
+        try:
+            return list(zip(locations, executor.map(load, locations)))
+        finally:
+            executor.shutdown()
+
+    @classmethod
+    def load_entry(cls, registry, location):
+        timings = {}
+        with timed(timings, 'fetch'):
+            content = registry.fetcher.fetch(location)
+        with timed(timings, 'parse'):
+            declaration = load_json(content)
+        return SpecEntry(location, declaration, sources={location: fingerprint(content)}, timings=timings)
 
     def _field_list_item(self, label, value):
         """Convenience method to create field list items.
@@ -118,7 +180,7 @@ class SwaggerDocDirective(Directive):
               docutils nodes
         """
         for api in api_objects:
-            print('Creating nodes for API with path: {}'.format(api['path']))
+            logger.debug('Creating nodes for API with path: %s', api['path'])
             yield nodes.title(text=api['path'])
             yield nodes.paragraph(text=api['description'])
 
@@ -157,19 +219,64 @@ class SwaggerDocDirective(Directive):
 
         return s
 
+    def create_listing(self, declarations):
+        """Create nodes for the API Declarations of a Resource Listing.
+
+        Args:
+            declarations (list): ``(location, entry)`` as returned by ``load_declarations``
+
+        Returns:
+            list: A section per declaration, or an error for those that failed to load or render
+        """
+        env = self.state.document.settings.env
+        entries = []
+        for location, declaration in declarations:
+            if isinstance(declaration, Exception):
+                logger.warning('Unable to process URL: %s: %s', location, declaration,
+                               location=(env.docname, self.lineno))
+                entries.append(self.make_error(location))
+                # Read the document again once the declaration can be fetched
+                note_sources(env, {location: None})
+                continue
+
+            note_sources(env, declaration.sources)
+            try:
+                entries.append(self.create_declaration(declaration.specification))
+            except Exception as e:
+                logger.warning('Unable to process URL: %s: %s', location, e, location=(env.docname, self.lineno))
+                logger.verbose(traceback.format_exc())
+                entries.append(self.make_error(location))
+
+        return entries
+
+    def make_error(self, url):
+        error = nodes.error('')
+        para = nodes.paragraph()
+        para += nodes.Text('Unable to process URL: ')
+        para += nodes.strong('', url)
+        para += nodes.Text('. Please check that the URL is a valid Swagger api-docs URL and it is accesible')
+        error += para
+        return error
+
     def run(self):
+        env = self.state.document.settings.env
+        timing = DirectiveTiming('swaggerdoc', env)
         try:
             source_url = self.arguments[0]
-            swaggerdoc = self.process_source(source_url)
-
-            return [self.create_declaration(swaggerdoc)]
-        except:
-            print('Unable to process URL: %s' % self.arguments[0])
-            traceback.print_exc()
-            error = nodes.error('')
-            para = nodes.paragraph()
-            para += nodes.Text('Unable to process URL: ')
-            para += nodes.strong('', self.arguments[0])
-            para += nodes.Text('. Please check that the URL is a valid Swagger api-docs URL and it is accesible')
-            error += para
-            return [error]
+            entry = self.process_source(source_url)
+
+            if self.is_resource_listing(entry.specification):
+                with timing.stage('fetch'):
+                    declarations = self.load_declarations(entry)
+                with timing.stage('render'):
+                    entries = self.create_listing(declarations)
+            else:
+                with timing.stage('render'):
+                    entries = [self.create_declaration(entry.specification)]
+
+            timing.finish(entry, entries)
+            return entries
+        except Exception as e:
+            logger.warning('Unable to process URL: %s: %s', self.arguments[0], e, location=(env.docname, self.lineno))
+            logger.verbose(traceback.format_exc())
+            return [self.make_error(self.arguments[0])]
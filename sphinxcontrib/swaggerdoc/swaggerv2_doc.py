@@ -1,52 +1,207 @@
 #1 -*- coding: utf-8 -*-
 from docutils import nodes
+import gc
 import traceback
+from contextlib import contextmanager
 
-from docutils.parsers.rst import Directive
-from past.builtins import basestring
+from docutils.parsers.rst import Directive, directives
 
+from sphinx import addnodes
 from sphinx.locale import _
 
+import six
 from six.moves.urllib import parse as urlparse   # Retain Py2 compatibility for urlparse
-import requests
-from requests_file import FileAdapter
-import json
-import yaml
-from prance import ResolvingParser
+from sphinx.util import logging
+
+from .artifact import SUFFIX as ARTIFACT_SUFFIX, read_artifact
+from .domain import OBJECT_TYPES, SECTION_ROLES, make_node_id, make_target, operation_name
+from .fetch import is_local
+from .fingerprint import collect_sources, fingerprint, note_sources, sources_changed
+from .fragments import make_record, note_fragments
+from .html_tables import HTML, current_renderer, make_table, note_renderer
+from .index import DEFAULT_GROUP, UNTAGGED_ID, UNTAGGED_TITLE, SpecIndex
+from .loader import load_spec
+from .parallel import render_parallel
+from .refs import absolute_refs, is_internal, make_ref, resolve_pointer
+from .registry import SpecEntry, get_registry
+from .spec_cache import SpecCache
+from .timing import DirectiveTiming, timed
+from .validation import check_spec
+
+logger = logging.getLogger(__name__)
+
+# Parts of a description the directive can render
+SECTIONS = ('methods', 'responses', 'definitions')
+
+
+def sections_option(argument):
+    """Parse the ``:sections:`` option, a comma or space separated subset of ``SECTIONS``."""
+    sections = argument.replace(',', ' ').split()
+    for section in sections:
+        if section not in SECTIONS:
+            raise ValueError('unknown section %r, expected one of %s' % (section, ', '.join(SECTIONS)))
+    return sections
+
+
+@contextmanager
+def paused_gc():
+    """Suspend the cyclic garbage collector in the ``with`` block.
+
+    Rendering allocates hundreds of thousands of nodes that all stay alive.
+    Each allocation counts towards the next collection, which scans every
+    tracked object of the build, the loaded descriptions included, and finds
+    nothing to free. Temporary objects are still freed by reference counting.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
 
 class SwaggerV2DocDirective(Directive):
 
-    DEFAULT_GROUP = ''
+    DEFAULT_GROUP = DEFAULT_GROUP
+
+    # Stand-in location remote descriptions are resolved against
+    REMOTE_BASE = 'file:///swaggerdoc-remote.yaml'
 
     # this enables content in the directive
     has_content = True
 
-    api_desc = []
-
-    def load_swagger(self, content):
-        try:
-            return json.loads(content)
-        except Exception:
-            return yaml.load(content)
-
-    def processSwaggerURL(self, url):
+    option_spec = {
+        'sections': sections_option,
+        'spec-name': directives.unchanged_required,
+        'untagged': directives.flag,
+    }
+
+    # Rendering state, see render(). Limits of 0 mean unlimited.
+    inline = False
+    max_depth = 0
+    max_properties = 0
+    max_nodes = 0
+    spec_name = None
+    refdoc = None
+    render_workers = 0
+    html_tables = False
+    _stack = ()
+    _depth = 0
+    _nodes = 0
+
+    @staticmethod
+    def load_swagger(content, content_type=None, name=None):
+        return load_spec(content, content_type, name)
+
+    def locate_swagger(self, url):
+        """Turn the URL given to the directive into an absolute path or URL.
+
+        Paths without a scheme are relative to the current document. They are
+        not noted as Sphinx dependencies: like remote descriptions, they are
+        tracked by fingerprint, so a change only outdates the documents whose
+        rendered fragments it affects.
+        """
         parsed_url = urlparse.urlparse(url)
-	print parsed_url
         if not parsed_url.scheme:  # Assume file relative to documentation
             env = self.state.document.settings.env
             relfn, absfn = env.relfn2path(url)
-            env.note_dependency(relfn)
+            return absfn
 
-            with open(absfn) as fd:
-                content = fd.read()
-            return self.load_swagger(content)
-        else:
-            print url
-            s = requests.Session()
-            s.mount('file://', FileAdapter())
-            r = s.get(url)
-	    print r.text
-            return self.load_swagger(r.text)
+        return url
+
+    def processSwaggerURL(self, url):
+        registry = get_registry(self.state.document.settings.env)
+        location = self.locate_swagger(url)
+        content, content_type = registry.fetcher.fetch_document(location)
+        return self.load_swagger(content, content_type, location)
+
+    @classmethod
+    def resolve_swagger(cls, registry, location, timings=None):
+        """Return the specification of the Swagger description at ``location``.
+
+        References to other files are resolved, internal references are kept.
+        Resolved specifications are cached on disk under the hash of the raw
+        description, so unchanged descriptions skip prance altogether. A cached
+        specification is only used while every file it pulls in through an
+        external ``$ref`` is unchanged as well. Validation follows
+        ``swaggerdoc_validation``, see ``validation.check_spec``.
+
+        Local descriptions compiled with ``python -m sphinxcontrib.swaggerdoc
+        compile`` are loaded as they are through a memory map. Compiled
+        descriptions are pickles, so they are only loaded from a local path
+        ending with ``.swgc`` and never recognized from fetched contents.
+
+        Args:
+            registry (SpecRegistry): Registry of the build
+            location (str): Absolute path or URL of the description
+            timings (dict): Receives the seconds spent in each loading stage
+
+        Returns:
+            tuple: ``(specification, sources, index)`` where ``sources`` maps the
+            location of the description and of every file it references to its
+            fingerprint and ``index`` is the ``SpecIndex`` of the specification
+        """
+        if timings is None:
+            timings = {}
+
+        if is_local(location) and location.endswith(ARTIFACT_SUFFIX):
+            with timed(timings, 'load'):
+                specification, index, content_hash = read_artifact(location)
+            return specification, {location: content_hash}, index
+
+        with timed(timings, 'fetch'):
+            content, content_type = registry.fetcher.fetch_document(location)
+
+        with timed(timings, 'cache'):
+            key = SpecCache.content_key(content, location)
+            cached = registry.cache.get(key)
+            if cached is not None and sources_changed(registry.fetcher, cached[1], {location: fingerprint(content)}):
+                cached = None
+
+        # prance treats every reference of a remote description as an HTTP
+        # reference, internal ones included. External references are made
+        # absolute and resolved against a local base to keep internal ones.
+        base = location if is_local(location) else cls.REMOTE_BASE
+        if cached is not None:
+            # Cached specifications may have been stored with validation off
+            check_spec(registry, cached[0], cached[1], base, timings)
+            return cached
+
+        # prance is only needed on a cache miss
+        from prance.util.resolver import RESOLVE_FILES, RESOLVE_HTTP, RefResolver
+
+        with timed(timings, 'parse'):
+            document = cls.load_swagger(content, content_type, location)
+            sources = collect_sources(registry.fetcher, location, content, document)
+
+        if not is_local(location):
+            document = absolute_refs(document, location)
+
+        # Resolve the document parsed above instead of letting prance fetch
+        # and parse the description again. Internal references are kept and
+        # resolved on demand while rendering.
+        with timed(timings, 'resolve'):
+            resolver = RefResolver(document, base, resolve_types=RESOLVE_FILES | RESOLVE_HTTP)
+            del content, document  # prance works on its own copy
+            resolver.resolve_references()
+            specification = resolver.specs
+
+        check_spec(registry, specification, sources, base, timings)
+
+        with timed(timings, 'index'):
+            index = SpecIndex(specification)
+
+        resolved = (specification, sources, index)
+        registry.cache.put(key, resolved)
+
+        return resolved
+
+    @classmethod
+    def load_entry(cls, registry, location):
+        timings = {}
+        specification, sources, index = cls.resolve_swagger(registry, location, timings)
+        return SpecEntry(location, specification, index, sources, timings)
 
     def create_item(self, key, value):
         para = nodes.paragraph()
@@ -66,15 +221,24 @@ class SwaggerV2DocDirective(Directive):
         return expanded_values
 
     def cell(self, contents):
-        if isinstance(contents, basestring):
+        if isinstance(contents, six.string_types):
             contents = nodes.paragraph(text=contents)
 
+        if isinstance(contents, list):
+            return nodes.entry('', *contents)
+
         return nodes.entry('', contents)
 
     def row(self, cells):
+        self._nodes += 1 + 2 * len(cells)
         return nodes.row('', *[self.cell(c) for c in cells])
 
     def create_table(self, head, body, colspec=None):
+        if self.html_tables:
+            # Rendered straight to HTML, with the size the node table would have
+            self._nodes += sum(1 + 2 * len(cells) for cells in [head] + body)
+            return make_table(head, body)
+
         table = nodes.table()
         tgroup = nodes.tgroup()
         table.append(tgroup)
@@ -103,6 +267,8 @@ class SwaggerV2DocDirective(Directive):
         head = ['Name', 'Position', 'Description', 'Type']
         body = []
         for param in parameters:
+            # Shared parameters are small, so they are inlined even in reference mode
+            param = self.resolve_ref(param)
             row = []
             req = param.get('required', False)
             if req:
@@ -129,19 +295,37 @@ class SwaggerV2DocDirective(Directive):
         entries.append(table)
         return entries
 
-    def make_properties(self, properties, required):
+    def make_properties(self, properties, required, ref=None):
         entries = []
         head = ['Name', 'Description', 'Type']
         body = []
-        for name, prop in properties.items():
-            row = []
-            if name in required:
-                row.append(name+'*')
+        items = list(properties.items())
+        if self.max_properties and len(items) > self.max_properties:
+            items, hidden = items[:self.max_properties], len(items) - self.max_properties
+        else:
+            hidden = 0
+
+        self._depth += 1
+        try:
+            for name, prop in items:
+                row = []
+                if name in required:
+                    row.append(name+'*')
+                else:
+                    row.append(name)
+                row.append(prop.get('description', ''))
+                row.append(self.make_object('', prop))
+                body.append(row)
+        finally:
+            self._depth -= 1
+
+        if hidden:
+            more = '{} more {}'.format(hidden, 'field' if hidden == 1 else 'fields')
+            if ref is not None and self._depth > 0:
+                body.append(['...', '', self.make_reference(more + ' in ', ref)])
             else:
-                row.append(name)
-            row.append(prop.get('description', ''))
-            row.append(self.make_object('', prop))
-            body.append(row)
+                body.append(['...', '', more])
+
         table = self.create_table(head, body)
         paragraph = nodes.paragraph()
         paragraph += nodes.strong('', 'Fields')
@@ -149,62 +333,135 @@ class SwaggerV2DocDirective(Directive):
         entries.append(table)
         return entries
 
+    def limit_reached(self):
+        """Whether nested objects must be collapsed instead of rendered as tables."""
+        if self.max_depth and self._depth >= self.max_depth:
+            return True
+        return bool(self.max_nodes) and self._nodes >= self.max_nodes
+
+    def expand_ref(self, ref):
+        """Return the object ``ref`` points to if it is to be rendered in place.
+
+        Returns None when the reference must be rendered as a link instead: in
+        reference mode, past the rendering limits, for references back to a
+        schema being rendered (recursive models) and for dangling references.
+        """
+        if not self.inline or not is_internal(ref) or ref in self._stack or self.limit_reached():
+            return None
+
+        try:
+            return resolve_pointer(self.api_desc, ref)
+        except (KeyError, IndexError, TypeError):
+            return None
+
+    def make_reference(self, name, ref):
+        """Link to the Responses or Definitions entry a ``$ref`` points to.
+
+        Within a directive with a ``:spec-name:``, the link is a cross-reference
+        to the label of the entry, which may be rendered in another document.
+        """
+        nref = None
+        if ref.startswith('#/responses/'):
+            nref = ref.replace('#/responses/', '')
+            section = 'responses'
+        if ref.startswith('#/definitions/'):
+            nref = ref.replace('#/definitions/', '')
+            section = 'definitions'
+
+        if nref is None:
+            return nodes.Text(name + ref)
+
+        swagger_node = nodes.paragraph('')
+        if self.spec_name is None:
+            swagger_node += nodes.reference('', '', nodes.Text(name + nref), postpone=True, internal=True, refid=nref)
+        else:
+            swagger_node += addnodes.pending_xref('', nodes.Text(name + nref), refdomain='swagger',
+                                                  reftype=SECTION_ROLES[section], reftarget=make_target(self.spec_name, nref),
+                                                  refexplicit=True, refwarn=True, refdoc=self.refdoc)
+        return swagger_node
+
+    def note_object(self, node, section, name, spec_name=None, primary=True):
+        """Register an entry of the ``:spec-name:`` description, or of ``spec_name``, in the ``swagger`` domain.
+
+        ``primary`` is false for the sections of the other tags of an operation,
+        see ``SwaggerDomain``.
+        """
+        env = self.state.document.settings.env
+        spec_name = spec_name or self.spec_name
+        objtype = OBJECT_TYPES[section]
+        node_id = make_node_id(self.state.document, spec_name, objtype, name)
+        node['ids'].append(node_id)
+        self.state.document.note_explicit_target(node)
+        env.get_domain('swagger').note_object(objtype, spec_name, name, node_id,
+                                              location=(env.docname, self.lineno), primary=primary)
+
+    def resolve_ref(self, obj):
+        """Return the object an internal ``$ref`` points to, or ``obj`` itself."""
+        ref = obj.get('$ref')
+        if not is_internal(ref):
+            return obj
+
+        return resolve_pointer(self.api_desc, ref)
+
     # Helper function - should really only be called from inside make_schema
-    def make_object(self, name, schema):
-        ref = schema.get('$ref')
-        if ref is not None:
-            if ref.startswith('#/responses/'):
-                nref = ref.replace('#/responses/', '')
-            if ref.startswith('#/definitions/'):
-                nref = ref.replace('#/definitions/', '')
-            if nref is None:
-                swagger_node = nodes.Text("THIS_IS_NOT_RIGHT")
+    def make_object(self, name, schema, ref=None):
+        nested_ref = schema.get('$ref')
+        if nested_ref is not None:
+            target = self.expand_ref(nested_ref)
+            if target is None:
+                return self.make_reference(name, nested_ref)
+
+            self._stack += (nested_ref,)
+            try:
+                return self.make_object(name, target, nested_ref)
+            finally:
+                self._stack = self._stack[:-1]
+
+        type = schema.get('type')
+        if type in ['boolean', 'string', 'integer']:
+            swagger_node = nodes.Text(name + type)
+        elif type == 'array':
+            items = schema.get('items')
+            if items is not None:
+                swagger_node = self.make_schema(name + 'array of ', items)
             else:
-                swagger_node = nodes.paragraph('')
-                swagger_node += nodes.reference('', '', nodes.Text(name + nref), postpone=True, internal=True, refid=nref)
-        else:
-            type = schema.get('type')
-            if type in ['boolean', 'string', 'integer']:
-                swagger_node = nodes.Text(name + type)
-            elif type == 'array':
-                items = schema.get('items')
-                if items is not None:
-                    swagger_node = self.make_schema(name + 'array of ', items)
+                swagger_node = nodes.Text("array of UNKNOWN type")
+        elif type == 'object':
+            props = schema.get('properties')
+            if props is not None:
+                if self.limit_reached():
+                    swagger_node = nodes.Text('{}object with {} {}'.format(
+                        name, len(props), 'field' if len(props) == 1 else 'fields'))
                 else:
-                    swagger_node = nodes.Text("array of UNKNOWN type")
-            elif type == 'object':
-                props = schema.get('properties')
+                    swagger_node = self.make_properties(props, schema.get('required', []), ref)
+            else:
+                props = schema.get('additionalProperties')
                 if props is not None:
-                    swagger_node = self.make_properties(schema.get('properties', {}), schema.get('required', []))
+                    swagger_node = nodes.Text(name + " map of strings to " + props.get("type", "Unknown"))
                 else:
-                    props = schema.get('additionalProperties')
-                    if props is not None:
-                        swagger_node = nodes.Text(name + " map of strings to " + props.get("type", "Unknown"))
-                    else:
-                        swagger_node = nodes.Text(name + "Raw Octet Stream")
-            elif type is None:
-                swagger_node = nodes.Text(name + "No Data Returned")
-            else:
-                swagger_node = nodes.Text(name + "UNKNOWN type (3) - " + str(schema))
+                    swagger_node = nodes.Text(name + "Raw Octet Stream")
+        elif type is None:
+            swagger_node = nodes.Text(name + "No Data Returned")
+        else:
+            swagger_node = nodes.Text(name + "UNKNOWN type (3) - " + str(schema))
 
         return swagger_node
 
     def make_schema(self, name, schema):
         ref = schema.get('$ref')
-        if ref is not None:
-            if ref.startswith('#/responses/'):
-                nref = ref.replace('#/responses/', '')
-            if ref.startswith('#/definitions/'):
-                nref = ref.replace('#/definitions/', '')
-            if nref is None:
-                core = nodes.Text("THIS_IS_NOT_RIGHT")
-            else:
-                core = nodes.paragraph('')
-                core += nodes.reference('', '', nodes.Text(name + nref), postpone=True, internal=True, refid=nref)
+        if ref is not None and self.expand_ref(ref) is None:
+            core = self.make_reference(name, ref)
         else:
-	    print json.dumps(schema, indent=2)
-            core = nodes.paragraph('Fields')
-            core += self.make_object(name, schema)
+            content = self.make_object(name, schema)
+            if isinstance(content, list):
+                # A field table. Paragraphs must not contain tables: the
+                # SmartQuotes transform handles the text of a paragraph once
+                # per enclosing paragraph, which is quadratic in the nesting
+                # depth of the schema.
+                core = nodes.container('', *content)
+            else:
+                core = nodes.paragraph('Fields')
+                core += content
 
         return core
 
@@ -235,9 +492,18 @@ class SwaggerV2DocDirective(Directive):
         return entries
 
     def make_response(self, name, obj):
+        self._stack = (make_ref('responses', name),)
+        try:
+            return self._make_response(name, obj)
+        finally:
+            self._stack = ()
+
+    def _make_response(self, name, obj):
         schema = obj.get('schema')
         desc = obj.get('description')
         if schema is not None:
+            # The specification is shared by every directive of the build
+            schema = dict(schema)
             if desc is not None:
                 schema['description'] = desc
         else:
@@ -275,6 +541,13 @@ class SwaggerV2DocDirective(Directive):
         return section
 
     def make_definition(self, name, obj):
+        self._stack = (make_ref('definitions', name),)
+        try:
+            return self._make_definition(name, obj)
+        finally:
+            self._stack = ()
+
+    def _make_definition(self, name, obj):
         section = self.create_section(name)
 
         swagger_node = nodes.admonition(name)
@@ -328,33 +601,13 @@ class SwaggerV2DocDirective(Directive):
 
         return [swagger_node]
 
-    def group_tags(self):
-        groups = {}
-
-        if 'tags' in self.api_desc:
-            for tag in self.api_desc['tags']:
-                groups[tag['name']] = []
-
-        if len(groups) == 0:
-            groups[SwaggerV2DocDirective.DEFAULT_GROUP] = []
-
-        for path, methods in self.api_desc['paths'].items():
-            for method_type, method in methods.items():
-                if SwaggerV2DocDirective.DEFAULT_GROUP in groups:
-                    groups[SwaggerV2DocDirective.DEFAULT_GROUP].append((path, method_type, method))
-                else:
-                    for tag in method['tags']:
-                        groups[tag].append((path, method_type, method))
-
-        return groups
-
-    def create_section(self, title):
-        section = nodes.section(ids=[title])
+    def create_section(self, title, section_id=None):
+        section = nodes.section(ids=[section_id or title])
         section += nodes.title(title, title)
         return section
 
     def check_tags(self, selected_tags, tags, api_url):
-        invalid_tags = list(set(selected_tags) - set(tags))
+        invalid_tags = [tag for tag in selected_tags if tag not in tags]
         if len(invalid_tags) > 0:
             msg = self.reporter.error("Error. Tag '%s' not found in Swagger URL %s." % (invalid_tags[0], api_url))
             return [msg]
@@ -369,50 +622,121 @@ class SwaggerV2DocDirective(Directive):
         else:
             selected_tags = []
 
+        env = self.state.document.settings.env
+        timing = DirectiveTiming('swaggerv2doc', env)
+        location = self.locate_swagger(api_url)
         try:
-            parser = ResolvingParser(api_url)
-            self.api_desc = parser.specification
-            groups = self.group_tags()
+            registry = get_registry(env)
+            entry = registry.get('swaggerv2doc', location, lambda: self.load_entry(registry, location))
+            note_sources(env, entry.sources)
+            self.api_desc = entry.specification
+            index = entry.index
+            groups = index.tags
+
+            if 'untagged' in self.options:
+                selected_tags.append(DEFAULT_GROUP)
+
+            self.check_tags(selected_tags, groups, api_url)
+
+            self.max_depth = env.config.swaggerdoc_max_depth
+            self.max_properties = env.config.swaggerdoc_max_properties
+            self.max_nodes = env.config.swaggerdoc_max_nodes
+            self.spec_name = self.options.get('spec-name')
+            self.refdoc = env.docname
+            self.render_workers = env.config.swaggerdoc_render_workers
+            self.html_tables = current_renderer(env) == HTML
+            note_renderer(env)
+            sections = self.options.get('sections', SECTIONS)
+            with timing.stage('render'), paused_gc():
+                entries = self.render(index, selected_tags, env.config.swaggerdoc_render_mode != 'reference',
+                                      sections)
+
+            note_fragments(env, make_record(entry, selected_tags, sections))
+            timing.finish(entry, entries)
+            return entries
+        except Exception as e:
+            note_fragments(env, None)
+            # Read the document again once the description changes
+            note_sources(env, {location: None})
+            error_message = 'Unable to process URL: %s' % api_url
+            logger.warning('%s: %s', error_message, e, location=(env.docname, self.lineno))
+            logger.verbose(traceback.format_exc())
+
+            error = nodes.error('')
+            para_error = nodes.paragraph()
+            para_error += nodes.Text(error_message + '. Please check that the URL is a valid Swagger api-docs URL and it is accesible')
+            para_error_detailed = nodes.paragraph()
+            para_error_detailed = nodes.strong('Processing error. See console output for a more detailed error')
+            error += para_error
+            error += para_error_detailed
+            return [error]
+
+    def render(self, index, selected_tags, inline, sections=SECTIONS):
+        """Create the nodes of the operations, responses and definitions to document.
 
-            self.check_tags(selected_tags, groups.keys(), api_url)
+        Args:
+            index (SpecIndex): Index of the specification
+            selected_tags (list): Tags to document, every tag when empty
+            inline (bool): Inline internal references instead of linking them
+            sections (list): Parts of the description to render, see ``SECTIONS``
+        """
+        # Internal references are kept in the loaded specification; inline
+        # mode resolves them while rendering, within the rendering limits
+        self.inline = inline
+        self._nodes = 0
 
-            entries = []
+        selected, responses, definitions = index.select(self.api_desc, selected_tags)
 
+        entries = []
+
+        if 'methods' in sections:
             method_section = self.create_section('Methods')
-            for tag_name, methods in groups.items():
-                if tag_name in selected_tags or len(selected_tags) == 0:
+            for tag_name, methods in selected:
+                if tag_name == DEFAULT_GROUP:
+                    section = self.create_section(UNTAGGED_TITLE, UNTAGGED_ID)
+                else:
                     section = self.create_section(tag_name)
 
-                    for path, method_type, method in methods:
-                        if method_type in ['$ref', 'parameters']:
-                            continue
-                        section += self.make_method(path, method_type, method)
+                for path, method_type, method in methods:
+                    method_nodes = self.make_method(path, method_type, method)
+                    if self.spec_name is not None:
+                        # Operations with several tags are registered under their first one
+                        home = (method.get('tags') or [DEFAULT_GROUP])[0]
+                        self.note_object(method_nodes[0], 'methods', operation_name(path, method_type, method),
+                                         primary=tag_name == home)
+                    section += method_nodes
 
-                    method_section.append(section)
+                method_section.append(section)
             entries.append(method_section)
 
+        if 'responses' in sections:
             responses_section = self.create_section('Responses')
-            for resp_name, response in self.api_desc.get('responses', {}).items():
-                responses_section.append(self.make_response(resp_name, response))
+            for resp_name, section in zip(responses, self.make_entries('responses', responses)):
+                if self.spec_name is not None:
+                    self.note_object(section, 'responses', resp_name)
+                responses_section.append(section)
             entries.append(responses_section)
 
+        if 'definitions' in sections:
             defs_section = self.create_section('Definitions')
-            for def_name, def_obj in self.api_desc.get('definitions', {}).items():
-                defs_section.append(self.make_definition(def_name, def_obj))
+            for def_name, section in zip(definitions, self.make_entries('definitions', definitions)):
+                if self.spec_name is not None:
+                    self.note_object(section, 'definitions', def_name)
+                defs_section.append(section)
             entries.append(defs_section)
-            from pprint import pprint
-	    pprint(entries)
-            return entries
-        except Exception as e:
-            error_message = 'Unable to process URL: %s' % api_url
-            print(error_message)
-            traceback.print_exc()
 
-            error = nodes.error('')
-            para_error = nodes.paragraph()
-            para_error += nodes.Text(error_message + '. Please check that the URL is a valid Swagger api-docs URL and it is accesible')
-            para_error_detailed = nodes.paragraph()
-            para_error_detailed = nodes.strong('Processing error. See console output for a more detailed error')
-            error += para_error
-            error += para_error_detailed
-            return [error]
+        return entries
+
+    def make_entries(self, section, objs):
+        """Create the sections of the ``responses`` or ``definitions`` in ``objs``, in order.
+
+        With ``swaggerdoc_render_workers``, large sections are rendered in a
+        process pool, unless ``max_nodes`` limits the size of the output.
+        """
+        if self.render_workers > 1 and not self.max_nodes:
+            rendered = render_parallel(self, section, list(objs), self.render_workers)
+            if rendered is not None:
+                return rendered
+
+        make = self.make_response if section == 'responses' else self.make_definition
+        return [make(name, obj) for name, obj in objs.items()]
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import pickle
+import time
+from contextlib import contextmanager
+
+from sphinx.util import logging
+
+from .util import per_doc_store
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def timed(timings, stage):
+    """Add the time spent in the ``with`` block to ``timings[stage]``."""
+    start = time.time()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.time() - start
+
+
+def count_nodes(entries):
+    count = 0
+    for entry in entries:
+        findall = getattr(entry, 'findall', entry.traverse)
+        count += sum(1 for node in findall())
+    return count
+
+
+class DirectiveTiming(object):
+    """Timings of a single directive run, kept in the environment for the build report.
+
+    Loading stages (``fetch``, ``parse``, ``resolve``, ``validate``...) come from
+    the registry entry of the description and are paid once per build, the
+    ``render`` stage is paid by every directive.
+    """
+
+    def __init__(self, directive, env):
+        self.env = env
+        self.record = {
+            'directive': directive,
+            'docname': env.docname,
+            'source': None,
+            'load': {},
+            'stages': {},
+            'nodes': 0,
+            'size': 0,
+        }
+
+    def stage(self, name):
+        return timed(self.record['stages'], name)
+
+    def finish(self, entry, entries):
+        """Record the nodes generated from ``entry`` and log the timings at verbose level.
+
+        Args:
+            entry (SpecEntry): Registry entry of the rendered description
+            entries (list): Nodes returned by the directive
+        """
+        record = self.record
+        record['source'] = entry.location
+        record['load'] = dict(entry.timings)
+        record['nodes'] = count_nodes(entries)
+        if self.env.config.swaggerdoc_timing_report:
+            record['size'] = len(pickle.dumps(entries, pickle.HIGHEST_PROTOCOL))
+
+        stages = dict(record['load'], **record['stages'])
+        logger.verbose('%s %s: %s, %d nodes', record['directive'], record['source'],
+                       ', '.join('%s %.3fs' % item for item in sorted(stages.items())),
+                       record['nodes'], location=self.env.docname)
+
+        per_doc_store(self.env, 'swaggerdoc_timings').setdefault(self.env.docname, []).append(record)
+
+
+def build_report(timings):
+    """Aggregate the directive timings of every document into the slowest specs and pages."""
+    specs = {}
+    pages = []
+    for docname, records in timings.items():
+        page = {'docname': docname, 'seconds': 0.0, 'nodes': 0, 'size': 0}
+        for record in records:
+            page['seconds'] += sum(record['stages'].values())
+            page['nodes'] += record['nodes']
+            page['size'] += record['size']
+
+            spec = specs.setdefault(record['source'], {
+                'source': record['source'],
+                'load': record['load'],
+                'seconds': sum(record['load'].values()),
+                'render_seconds': 0.0,
+                'directives': 0,
+            })
+            spec['render_seconds'] += record['stages'].get('render', 0.0)
+            spec['directives'] += 1
+        pages.append(page)
+
+    return {
+        'specs': sorted(specs.values(), key=lambda spec: spec['seconds'] + spec['render_seconds'], reverse=True),
+        'pages': sorted(pages, key=lambda page: page['seconds'], reverse=True),
+    }
+
+
+def write_report(app, exception):
+    """Write the timing report configured by ``swaggerdoc_timing_report`` at the end of the build."""
+    filename = app.config.swaggerdoc_timing_report
+    if exception is not None or not filename:
+        return
+
+    report = build_report(per_doc_store(app.env, 'swaggerdoc_timings'))
+    path = os.path.join(str(app.outdir), filename)
+    with open(path, 'w') as fd:
+        json.dump(report, fd, indent=2)
+
+    for spec in report['specs'][:5]:
+        logger.verbose('slowest spec %s: load %.3fs, render %.3fs',
+                       spec['source'], spec['seconds'], spec['render_seconds'])
+    logger.info('swaggerdoc timing report written to %s', path)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Attributes of the environment holding data per document, see per_doc_store
+DOC_STORES = (
+    'swaggerdoc_sources',  # Fingerprints of the descriptions read, see fingerprint.note_sources
+    'swaggerdoc_fragments',  # What each directive rendered, see fragments.note_fragments
+    'swaggerdoc_timings',  # Timings of each directive, see timing.DirectiveTiming
+    'swaggerdoc_renderers',  # Renderer of the tables, see html_tables.note_renderer
+)
+
+
+def per_doc_store(env, attr):
+    """Return the dict of ``env`` keyed by docname stored under ``attr``, creating it on first use.
+
+    Entries of the attributes listed in ``DOC_STORES`` are dropped when their
+    document is read again and merged back from parallel readers.
+    """
+    try:
+        return getattr(env, attr)
+    except AttributeError:
+        store = {}
+        setattr(env, attr, store)
+        return store
+
+
+def purge_doc(app, env, docname):
+    for attr in DOC_STORES:
+        if hasattr(env, attr):
+            getattr(env, attr).pop(docname, None)
+
+
+def merge_info(app, env, docnames, other):
+    for attr in DOC_STORES:
+        if not hasattr(other, attr):
+            continue
+
+        store = per_doc_store(env, attr)
+        for docname in docnames:
+            if docname in getattr(other, attr):
+                store[docname] = getattr(other, attr)[docname]
+
+
+@contextmanager
+def atomic_write(path, shared=False):
+    """Write a file through a temporary file renamed to ``path`` when the ``with`` block succeeds.
+
+    Readers never see a partially written file. The directory of ``path`` is
+    created if needed.
+
+    Args:
+        path (str): Path of the file
+        shared (bool): Give the file the permissions the umask allows instead
+            of making it readable by its owner only. Changing the umask is not
+            thread-safe, leave it off for files written during a build.
+
+    Yields:
+        file: The temporary file, opened in binary mode
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            yield tmp
+        if shared:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        getattr(os, 'replace', os.rename)(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+
+from sphinx.errors import ConfigError
+
+from .spec_cache import mark_used
+from .timing import timed
+from .util import atomic_write
+
+# Values of swaggerdoc_validation, see check_spec
+VALIDATION_MODES = ('off', 'always', 'cached')
+
+
+class ValidationCache(object):
+    """Record of the descriptions that passed validation.
+
+    A description is identified by the fingerprints of its sources, i.e. the
+    contents of the description and of every file it references, and by the
+    validation backend. Each validated description leaves an empty marker file
+    in ``directory``, so a later build validating the same contents with the
+    same backend skips validation.
+    """
+
+    # Bump whenever the validation performed for a marker changes
+    VERSION = '1'
+    SUFFIX = '.valid'
+
+    def __init__(self, directory, enabled=True):
+        """
+        Args:
+            directory (str): Directory holding the markers. Created on first write.
+            enabled (bool): Whether markers are read and written at all
+        """
+        self.directory = directory
+        self.enabled = enabled
+
+    @classmethod
+    def key(cls, sources, backend=None):
+        """Compute the key of a description from the fingerprints of its sources.
+
+        Args:
+            sources (dict): Fingerprint of every source keyed by its location
+            backend (str): Validation backend, ``None`` for prance's default
+        """
+        digest = hashlib.sha256()
+        digest.update(cls.VERSION.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update((backend or 'default').encode('utf-8'))
+        for location, value in sorted(sources.items()):
+            digest.update(b'\0')
+            digest.update(location.encode('utf-8'))
+            digest.update(b'\0')
+            digest.update(value.encode('utf-8'))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def __contains__(self, key):
+        if not self.enabled or not os.path.exists(self.path(key)):
+            return False
+
+        mark_used(self.path(key))
+        return True
+
+    def add(self, key):
+        if not self.enabled:
+            return
+
+        with atomic_write(self.path(key)):
+            pass
+
+
+def validate(specification, base, backend=None):
+    """Validate a resolved Swagger specification with prance.
+
+    Args:
+        specification (dict): The resolved specification
+        base (str): Location the specification was resolved against
+        backend (str): ``flex``, ``swagger-spec-validator`` or
+            ``openapi-spec-validator``, ``None`` for the first one installed
+
+    Raises:
+        prance.ValidationError: The specification is invalid
+        ValueError: The backend is not installed
+    """
+    from prance import BaseParser
+    from prance.util import validation_backends
+
+    options = {}
+    if backend is not None:
+        if backend not in validation_backends():
+            raise ValueError('validation backend {} is not installed'.format(backend))
+        options['backend'] = backend
+    parser = BaseParser(base, lazy=True, **options)
+    parser.specification = specification
+    prance_validate(parser)
+
+
+def prance_validate(parser):
+    """Validate ``parser.specification`` as it is, without parsing nor resolving it again.
+
+    Compatibility shim around prance's private API: prance only validates as
+    part of ``BaseParser.parse``, which loads the description again from its
+    URL. The validation step on its own is the private ``BaseParser._validate``.
+    This is the only place calling it, so that a prance release renaming it
+    fails here with a clear message.
+    """
+    try:
+        validate_specification = parser._validate
+    except AttributeError:
+        raise RuntimeError('This version of prance cannot validate a loaded specification, '
+                           'set swaggerdoc_validation to off')
+    validate_specification()
+
+
+def check_spec(registry, specification, sources, base, timings):
+    """Validate a specification as configured by ``swaggerdoc_validation``.
+
+    The mode is ``off``, ``always`` or ``cached``. In ``cached`` mode,
+    descriptions whose sources already passed validation with the configured
+    backend are not validated again. Without a configuration, e.g. when
+    compiling a description, it is always validated.
+
+    Args:
+        registry (SpecRegistry): Registry of the build
+        specification (dict): The resolved specification
+        sources (dict): Fingerprint of every source of the specification keyed by its location
+        base (str): Location the specification was resolved against
+        timings (dict): Receives the seconds spent validating
+
+    Raises:
+        ValueError: The mode is unknown
+    """
+    config = registry.config
+    mode = config.swaggerdoc_validation if config is not None else 'always'
+    backend = config.swaggerdoc_validation_backend if config is not None else None
+    if mode not in VALIDATION_MODES:
+        raise ValueError('unknown swaggerdoc_validation {!r}, expected one of {}'.format(
+            mode, ', '.join(VALIDATION_MODES)))
+    if mode == 'off':
+        return
+
+    key = ValidationCache.key(sources, backend)
+    if mode == 'cached' and key in registry.validated:
+        return
+
+    with timed(timings, 'validate'):
+        validate(specification, base, backend)
+
+    if mode == 'cached':
+        registry.validated.add(key)
+
+
+def check_config(app):
+    """Reject an unknown ``swaggerdoc_validation`` before any description is loaded."""
+    if app.config.swaggerdoc_validation not in VALIDATION_MODES:
+        raise ConfigError('swaggerdoc_validation must be one of {}, not {!r}'.format(
+            ', '.join(VALIDATION_MODES), app.config.swaggerdoc_validation))
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import unittest
+
+from six.moves import BaseHTTPServer
+
+from sphinxcontrib.swaggerdoc.artifact import FORMAT_VERSION, HEADER, MAGIC, write_artifact
+from sphinxcontrib.swaggerdoc.fetch import SpecFetcher
+from sphinxcontrib.swaggerdoc.index import SpecIndex
+from sphinxcontrib.swaggerdoc.registry import SpecRegistry
+from sphinxcontrib.swaggerdoc.spec_cache import SpecCache
+from sphinxcontrib.swaggerdoc.swaggerv2_doc import SwaggerV2DocDirective
+
+SPECIFICATION = {'swagger': '2.0', 'info': {'title': 'Petstore', 'version': '1.0'}, 'paths': {}}
+
+UNPICKLED = []
+
+
+def unpickled():
+    UNPICKLED.append(True)
+
+
+class Payload(object):
+    """Records that it was unpickled."""
+
+    def __reduce__(self):
+        return unpickled, ()
+
+
+class ArtifactHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Serves a compiled description carrying ``Payload``."""
+
+    def do_GET(self):
+        content = HEADER.pack(MAGIC, FORMAT_VERSION) + pickle.dumps(Payload())
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CompiledDescriptionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='swaggerdoc-test-')
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.registry = SpecRegistry(None, SpecCache(os.path.join(self.directory, 'cache'), 0),
+                                     SpecFetcher(os.path.join(self.directory, 'http')))
+        del UNPICKLED[:]
+
+    def test_local(self):
+        path = os.path.join(self.directory, 'petstore.swgc')
+        write_artifact(path, SPECIFICATION, SpecIndex(SPECIFICATION))
+
+        specification, sources, index = SwaggerV2DocDirective.resolve_swagger(self.registry, path)
+        self.assertEqual(specification, SPECIFICATION)
+        self.assertEqual(list(sources), [path])
+
+    def test_remote(self):
+        server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), ArtifactHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        url = 'http://127.0.0.1:{}/petstore.swgc'.format(server.server_address[1])
+        with self.assertRaises(Exception):
+            SwaggerV2DocDirective.resolve_swagger(self.registry, url)
+        self.assertEqual(UNPICKLED, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
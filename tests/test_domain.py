@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from util import CONF, PETSTORE, Project
+
+# addPet is rendered under pet first, its primary place is its first tag, store
+MULTI_TAGGED = PETSTORE.replace(u'tags: [pet]\n      operationId: addPet', u'tags: [store, pet]\n      operationId: addPet')
+
+INDEX = u'''API
+===
+
+Pets are created by :swagger:op:`petstore:addPet`.
+
+'''
+
+
+class MultiTaggedOperationTest(unittest.TestCase):
+
+    def test_one_directive(self):
+        project = Project({
+            u'petstore.yaml': MULTI_TAGGED,
+            u'index.rst': INDEX + u'.. swaggerv2doc:: petstore.yaml\n   :spec-name: petstore\n',
+        })
+        self.addCleanup(project.cleanup)
+
+        self.assertEqual(project.build(), u'')
+        self.assertIn(b'href="#swagger-petstore-operation-addpet-1"', project.read('index.html'))
+
+    def test_secondary_tag_only(self):
+        project = Project({
+            u'petstore.yaml': MULTI_TAGGED,
+            u'index.rst': INDEX + u'.. swaggerv2doc::\n   :spec-name: petstore\n\n   petstore.yaml\n   pet\n',
+        })
+        self.addCleanup(project.cleanup)
+
+        self.assertEqual(project.build(), u'')
+        self.assertIn(b'href="#swagger-petstore-operation-addpet"', project.read('index.html'))
+
+    def test_tag_pages(self):
+        project = Project({
+            u'conf.py': CONF + u"swaggerdoc_pages = {'petstore': 'petstore.yaml'}\n",
+            u'petstore.yaml': MULTI_TAGGED,
+            u'index.rst': INDEX + u'.. toctree::\n\n   petstore/index\n',
+        })
+        self.addCleanup(project.cleanup)
+
+        self.assertEqual(project.build(), u'')
+        self.assertIn(b'href="petstore/store.html#swagger-petstore-operation-addpet"', project.read('index.html'))
+
+
+if __name__ == '__main__':
+    unittest.main()
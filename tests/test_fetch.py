@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import shutil
+import tempfile
+import threading
+import unittest
+
+from six.moves import BaseHTTPServer
+
+from sphinxcontrib.swaggerdoc.fetch import SpecFetcher
+
+SPEC = b'swagger: "2.0"\ninfo: {title: Petstore, version: "1.0"}\npaths: {}\n'
+
+
+class SpecHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Serves ``SPEC`` with an ETag and answers conditional requests with ``304``."""
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+            self.send_header('Content-Type', 'application/yaml')
+            self.send_header('Content-Length', str(len(SPEC)))
+            self.end_headers()
+            self.wfile.write(SPEC)
+
+    def send_response(self, code, message=None):
+        self.server.codes.append(code)
+        BaseHTTPServer.BaseHTTPRequestHandler.send_response(self, code, message)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SpecFetcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), SpecHandler)
+        self.server.codes = []
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.directory = tempfile.mkdtemp(prefix='swaggerdoc-test-')
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def test_revalidation(self):
+        url = 'http://127.0.0.1:{}/petstore.yaml'.format(self.server.server_address[1])
+
+        first = SpecFetcher(self.directory).fetch_document(url)
+        # A new fetcher only shares the stored responses, as the next build would
+        second = SpecFetcher(self.directory).fetch_document(url)
+
+        self.assertEqual(self.server.codes, [200, 304])
+        self.assertEqual(first, (SPEC, 'application/yaml'))
+        self.assertEqual(second, first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from util import PETSTORE, Project
+
+try:
+    from sphinx.util.jsdump import loads  # older Sphinx does not write JSON
+except ImportError:
+    from json import loads
+
+
+def search_terms(content):
+    """Return the terms of a ``searchindex.js`` and the pages they are found on."""
+    index = loads(content[content.index(b'(') + 1:content.rindex(b')')].decode('utf-8'))
+    return {term: sorted(pages) if isinstance(pages, list) else [pages]
+            for term, pages in index['terms'].items()}
+
+
+class HtmlTablesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project = Project({
+            u'index.rst': u'API\n===\n\n.. swaggerv2doc:: petstore.yaml\n',
+            u'petstore.yaml': PETSTORE.replace(u'description: The name',
+                                               u'description: "Zanzibar pet <nickname> & tag"'),
+        })
+        self.addCleanup(self.project.cleanup)
+
+    def test_same_output(self):
+        self.project.build('nodes')
+        self.project.build('tables', swaggerdoc_html_tables=True)
+        self.assertEqual(self.project.read('index.html', 'nodes'), self.project.read('index.html', 'tables'))
+
+    def test_search_index(self):
+        self.project.build('nodes')
+        self.project.build('tables', swaggerdoc_html_tables=True)
+        terms = search_terms(self.project.read('searchindex.js', 'nodes'))
+        self.assertIn('zanzibar', terms)
+        self.assertEqual(terms, search_terms(self.project.read('searchindex.js', 'tables')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from util import PETSTORE, Project
+
+
+class IncrementalBuildTest(unittest.TestCase):
+    """Documents are read again when the descriptions they render change."""
+
+    def setUp(self):
+        self.project = Project({
+            u'index.rst': u'API\n===\n\n.. swaggerv2doc:: petstore.yaml\n',
+            u'petstore.yaml': PETSTORE,
+        })
+        self.addCleanup(self.project.cleanup)
+
+    def test_fixed_description(self):
+        self.project.write(u'petstore.yaml', u'swagger: "2.0\npaths: [\n')
+        warnings = self.project.build()
+        self.assertIn(u'Unable to process URL', warnings)
+        self.assertIn(u'Unable to process URL', self.project.read('index.html').decode('utf-8'))
+
+        self.project.write(u'petstore.yaml', PETSTORE)
+        warnings = self.project.build()
+        self.assertNotIn(u'Unable to process URL', warnings)
+        page = self.project.read('index.html').decode('utf-8')
+        self.assertNotIn(u'Unable to process URL', page)
+        self.assertIn(u'Find pet', page)
+
+    def test_changed_description(self):
+        self.project.build()
+        self.project.write(u'petstore.yaml', PETSTORE.replace(u'Find pet', u'Find a pet'))
+        self.project.build()
+        self.assertIn(u'Find a pet', self.project.read('index.html').decode('utf-8'))
+
+    def test_new_tag(self):
+        self.project.build()
+        self.project.write(u'petstore.yaml', PETSTORE.replace(u'  - name: store\n', u'  - name: store\n  - name: extra\n'))
+        self.project.build()
+        self.assertIn(u'id="extra"', self.project.read('index.html').decode('utf-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from sphinxcontrib.swaggerdoc import loader
+
+
+class LoadSpecTest(unittest.TestCase):
+
+    def setUp(self):
+        # Parse with the standard library even when a faster backend is installed
+        self.addCleanup(setattr, loader, '_json', loader._json)
+        loader._json = json
+
+    def test_json_bytes(self):
+        content = u'\ufeff{"swagger": "2.0", "info": {"title": "P\xe9tstore"}}'.encode('utf-8')
+        self.assertEqual(loader.load_spec(content, name='petstore.json'),
+                         {u'swagger': u'2.0', u'info': {u'title': u'P\xe9tstore'}})
+
+    def test_mislabelled_yaml(self):
+        self.assertEqual(loader.load_spec(b'swagger: "2.0"\n', 'application/json'), {u'swagger': u'2.0'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import os
+import unittest
+
+from util import CONF, PETSTORE, Project
+
+
+class GeneratedPagesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project = Project({
+            u'conf.py': CONF + u"swaggerdoc_pages = {'api/pets': 'petstore.yaml'}\n",
+            u'petstore.yaml': PETSTORE,
+            u'index.rst': u'API\n===\n\n.. toctree::\n\n   api/pets/index\n',
+        })
+        self.addCleanup(self.project.cleanup)
+
+    def page_exists(self, docname):
+        return os.path.exists(os.path.join(self.project.srcdir, *docname.split('/')) + '.rst')
+
+    def test_renamed_tag(self):
+        self.assertEqual(self.project.build(), u'')
+        self.assertTrue(self.page_exists('api/pets/store'))
+
+        self.project.write(u'petstore.yaml', PETSTORE.replace(u'store', u'shop'))
+        self.assertEqual(self.project.build(), u'')
+        self.assertFalse(self.page_exists('api/pets/store'))
+        self.assertTrue(self.page_exists('api/pets/shop'))
+        self.assertIn(b'id="shop"', self.project.read('api/pets/shop.html'))
+
+
+if __name__ == '__main__':
+    unittest.main()
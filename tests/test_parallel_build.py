@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import unittest
+import zlib
+
+from util import CONF, PETSTORE, Project
+
+INDEX = u'''API
+===
+
+Pets are described by :swagger:def:`api/pets:Pet` and created by :swagger:op:`api/pets:addPet`.
+
+.. toctree::
+
+   api/pets/index
+   api/store/index
+   pet
+   models
+'''
+
+PET = u'''Pet
+===
+
+.. swaggerv2doc:: petstore.yaml
+   pet
+'''
+
+MODELS = u'''Models
+======
+
+.. swaggerv2doc::
+   :spec-name: models
+   :sections: definitions
+
+   petstore.yaml
+'''
+
+
+def inventory(content):
+    """Return the entries of an ``objects.inv`` but for httpdomain's routing table.
+
+    httpdomain does not merge the legacy ``routingtable`` label of parallel builds.
+    """
+    header = b''.join(content.splitlines(True)[:4])
+    lines = zlib.decompress(content[len(header):]).splitlines()
+    return header, sorted(line for line in lines if b'routingtable' not in line)
+
+
+class ParallelBuildTest(unittest.TestCase):
+    """Parallel builds must produce the same output as serial ones."""
+
+    def setUp(self):
+        self.project = Project({
+            u'conf.py': CONF + u"swaggerdoc_pages = {'api/pets': 'petstore.yaml', 'api/store': 'store.yaml'}\n",
+            u'petstore.yaml': PETSTORE,
+            u'store.yaml': PETSTORE.replace(u'title: Petstore', u'title: Store'),
+            u'index.rst': INDEX,
+            u'pet.rst': PET,
+            u'models.rst': MODELS,
+        })
+        self.addCleanup(self.project.cleanup)
+
+    def test_same_output(self):
+        serial_warnings = self.project.build('serial', parallel=1)
+        parallel_warnings = self.project.build('parallel', parallel=4)
+
+        pages = self.project.outputs('serial')
+        self.assertIn('api/pets/definitions.html', pages)
+        self.assertEqual(pages, self.project.outputs('parallel'))
+        for page in pages:
+            self.assertEqual(self.project.read(page, 'serial'), self.project.read(page, 'parallel'), page)
+
+        self.assertEqual(inventory(self.project.read('objects.inv', 'serial')),
+                         inventory(self.project.read('objects.inv', 'parallel')))
+        self.assertEqual(sorted(serial_warnings.splitlines()), sorted(parallel_warnings.splitlines()))
+
+
+if __name__ == '__main__':
+    unittest.main()
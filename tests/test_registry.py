@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import gc
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from sphinxcontrib.swaggerdoc.fetch import SpecFetcher
+from sphinxcontrib.swaggerdoc.registry import SpecRegistry, get_registry
+from sphinxcontrib.swaggerdoc.spec_cache import SpecCache
+from sphinxcontrib.swaggerdoc.swaggerv2_doc import SwaggerV2DocDirective
+
+from util import Project, large_spec
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+
+class SpecRegistryTest(unittest.TestCase):
+
+    def test_concurrent_loads(self):
+        registry = SpecRegistry(None, SpecCache('unused', 0), SpecFetcher('unused'))
+        loads = []
+        lock = threading.Lock()
+
+        def factory():
+            with lock:
+                loads.append(None)
+            time.sleep(0.05)
+            return object()
+
+        executor = ThreadPoolExecutor(max_workers=8)
+        try:
+            entries = list(executor.map(lambda n: registry.get('swaggerv2doc', '/specs/../specs/a.yaml', factory),
+                                        range(16)))
+        finally:
+            executor.shutdown()
+
+        self.assertEqual(1, len(loads))
+        self.assertEqual(1, len(set(map(id, entries))))
+        self.assertIs(entries[0], registry.get('swaggerv2doc', '/specs/a.yaml', factory))
+
+
+def traced_size():
+    """Return the bytes allocated since tracing started that are still alive."""
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+@unittest.skipIf(tracemalloc is None, 'tracemalloc needs Python 3')
+class ReleaseTest(unittest.TestCase):
+    """Descriptions are released once every document has been read."""
+
+    def test_write_phase(self):
+        project = Project({
+            u'index.rst': u'API\n===\n',
+            u'large.json': large_spec(600, 20),
+        })
+        self.addCleanup(project.cleanup)
+        sizes = {}
+
+        def load(app, env, docnames):
+            # Tracing starts with the description, rendering or validating under tracemalloc is far too slow
+            tracemalloc.start()
+            specs = get_registry(env)
+            location = os.path.join(str(app.srcdir), 'large.json')
+            specs.get('swaggerv2doc', location, lambda: SwaggerV2DocDirective.load_entry(specs, location))
+            sizes['loaded'] = traced_size()
+
+        def updated(app, env):
+            sizes['updated'] = traced_size()
+            tracemalloc.stop()
+
+        def setup(app):
+            app.connect('env-before-read-docs', load)
+            app.connect('env-updated', updated)
+
+        try:
+            self.assertEqual(project.build(setup=setup, swaggerdoc_validation='off'), u'')
+        finally:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+        self.assertGreater(sizes['loaded'], 1024 * 1024)
+        self.assertLess(sizes['updated'], sizes['loaded'] / 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from sphinxcontrib.swaggerdoc import parallel
+
+from util import Project, large_spec
+
+
+class RenderWorkersTest(unittest.TestCase):
+    """A pool of processes renders the same sections as the build process."""
+
+    def setUp(self):
+        self.project = Project({
+            u'index.rst': u'API\n===\n\n.. swaggerv2doc:: large.json\n',
+            u'large.json': large_spec(100, 5),
+        })
+        self.addCleanup(self.project.cleanup)
+        self.serial_warnings = self.project.build('serial', swaggerdoc_validation='off')
+
+    def test_same_output(self):
+        warnings = self.project.build('workers', swaggerdoc_validation='off', swaggerdoc_render_workers=2)
+        self.assertEqual(self.project.read('index.html', 'serial'), self.project.read('index.html', 'workers'))
+        if parallel.POOL_SUPPORTED:
+            self.assertEqual(warnings, self.serial_warnings)
+
+    def test_unsupported_python(self):
+        self.addCleanup(setattr, parallel, 'POOL_SUPPORTED', parallel.POOL_SUPPORTED)
+        parallel.POOL_SUPPORTED = False
+
+        warnings = self.project.build('workers', swaggerdoc_validation='off', swaggerdoc_render_workers=2)
+        self.assertIn(u'swaggerdoc_render_workers needs Python 3.7', warnings)
+        self.assertEqual(self.project.read('index.html', 'serial'), self.project.read('index.html', 'workers'))
+
+
+if __name__ == '__main__':
+    unittest.main()
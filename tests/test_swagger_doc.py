@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from util import Project
+
+LISTING = {
+    'swaggerVersion': '1.2',
+    'apiVersion': '1.0',
+    'apis': [{'path': '/pet.{format}'}, {'path': '/broken.{format}'}, {'path': '/user.{format}'}],
+}
+
+
+def declaration(resource, api):
+    return {
+        'swaggerVersion': '1.2',
+        'basePath': 'http://example.com/api',
+        'resourcePath': '/' + resource,
+        'apis': [dict(api, path='/{}/{{id}}'.format(resource),
+                      operations=[{'method': 'GET', 'summary': 'Find a ' + resource}])],
+    }
+
+
+class ResourceListingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project = Project({
+            u'index.rst': u'API\n===\n\n.. swaggerdoc:: listing/api-docs.json\n',
+            u'listing/api-docs.json': json.dumps(LISTING),
+            u'listing/pet.json': json.dumps(declaration('pet', {'description': 'Pets'})),
+            # The API misses its description
+            u'listing/broken.json': json.dumps(declaration('broken', {})),
+            u'listing/user.json': json.dumps(declaration('user', {'description': 'Users'})),
+        })
+        self.addCleanup(self.project.cleanup)
+
+    def test_invalid_declaration(self):
+        warnings = self.project.build()
+
+        page = self.project.read('index.html').decode('utf-8')
+        self.assertIn(u'Find a pet', page)
+        self.assertIn(u'Find a user', page)
+        self.assertIn(u'broken.json', page)
+        self.assertEqual(1, len(warnings.splitlines()), warnings)
+        self.assertIn(u'broken.json', warnings)
+
+
+if __name__ == '__main__':
+    unittest.main()
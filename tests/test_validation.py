@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from sphinx.errors import ConfigError
+
+from util import PETSTORE, Project
+
+
+class ValidationConfigTest(unittest.TestCase):
+
+    def setUp(self):
+        self.project = Project({
+            u'index.rst': u'API\n===\n\n.. swaggerv2doc:: petstore.yaml\n',
+            u'petstore.yaml': PETSTORE,
+        })
+        self.addCleanup(self.project.cleanup)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ConfigError):
+            self.project.build(swaggerdoc_validation='sometimes')
+
+    def test_invalid_description(self):
+        self.project.write(u'petstore.yaml', PETSTORE.replace(u'in: path', u'in: nowhere'))
+        self.assertIn(u'Unable to process URL', self.project.build(swaggerdoc_validation='always'))
+        self.assertNotIn(u'Unable to process URL', self.project.build('off', swaggerdoc_validation='off'))
+
+
+if __name__ == '__main__':
+    unittest.main()
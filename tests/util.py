@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""Small Sphinx projects using the extension, built in temporary directories."""
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from six import StringIO
+from sphinx.application import Sphinx
+from sphinx.util.docutils import docutils_namespace
+
+# Sphinx before 2.0 looks for contents.rst by default
+CONF = u"extensions = ['sphinxcontrib.swaggerdoc']\nmaster_doc = 'index'\n"
+
+PETSTORE = u'''swagger: "2.0"
+info:
+  title: Petstore
+  version: "1.0"
+basePath: /v2
+tags:
+  - name: pet
+  - name: store
+paths:
+  /pet:
+    post:
+      tags: [pet]
+      operationId: addPet
+      summary: Add a pet
+      parameters:
+        - in: body
+          name: body
+          required: true
+          schema:
+            $ref: "#/definitions/Pet"
+      responses:
+        "200":
+          description: ok
+          schema:
+            $ref: "#/definitions/Pet"
+        "404":
+          $ref: "#/responses/NotFound"
+  /pet/{petId}:
+    get:
+      tags: [pet]
+      operationId: getPet
+      summary: Find pet
+      parameters:
+        - in: path
+          name: petId
+          required: true
+          type: integer
+      responses:
+        "200":
+          description: ok
+          schema:
+            type: array
+            items:
+              $ref: "#/definitions/Pet"
+  /store/order:
+    post:
+      tags: [store]
+      operationId: placeOrder
+      summary: Place an order
+      parameters:
+        - in: body
+          name: body
+          schema:
+            $ref: "#/definitions/Order"
+      responses:
+        "200":
+          description: ok
+          schema:
+            $ref: "#/definitions/Order"
+responses:
+  NotFound:
+    description: Not found
+    schema:
+      $ref: "#/definitions/Error"
+definitions:
+  Category:
+    type: object
+    properties:
+      id: {type: integer}
+      name: {type: string}
+  Pet:
+    type: object
+    required: [name]
+    properties:
+      id: {type: integer}
+      name: {type: string, description: The name}
+      category:
+        $ref: "#/definitions/Category"
+      tags:
+        type: array
+        items: {type: string}
+  Order:
+    type: object
+    properties:
+      id: {type: integer}
+      petId: {type: integer}
+      complete: {type: boolean}
+  Error:
+    type: object
+    properties:
+      code: {type: integer}
+      message: {type: string}
+  Node:
+    type: object
+    properties:
+      child:
+        $ref: "#/definitions/Node"
+'''
+
+
+def large_spec(models, fields):
+    """Return a Swagger 2.0 description in JSON with ``models`` definitions of ``fields`` properties each."""
+    definitions = dict((u'Model{}'.format(model), {
+        u'type': u'object',
+        u'properties': dict((u'field{}'.format(field), {u'type': u'string',
+                                                         u'description': u'Field {} of model {}'.format(field, model)})
+                            for field in range(fields)),
+    }) for model in range(models))
+    return json.dumps({u'swagger': u'2.0', u'info': {u'title': u'Large', u'version': u'1.0'}, u'paths': {},
+                       u'definitions': definitions})
+
+
+class Project(object):
+    """A Sphinx project in a temporary directory.
+
+    Files are given as ``{path: content}`` with paths relative to the source
+    directory. ``conf.py`` enables the extension unless given.
+    """
+
+    def __init__(self, files):
+        self.directory = tempfile.mkdtemp(prefix='swaggerdoc-test-')
+        self.srcdir = os.path.join(self.directory, 'src')
+        os.makedirs(self.srcdir)
+        files = dict(files)
+        files.setdefault('conf.py', CONF)
+        for path, content in files.items():
+            self.write(path, content)
+
+    def write(self, path, content):
+        path = os.path.join(self.srcdir, *path.split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with io.open(path, 'w', encoding='utf-8') as fd:
+            fd.write(content)
+
+    def build(self, name='html', builder='html', parallel=0, freshenv=False, setup=None, **confoverrides):
+        """Build the project into ``<name>`` and return the warnings of the build.
+
+        ``setup`` is called with the application before it builds, e.g. to connect to its events.
+        """
+        outdir = os.path.join(self.directory, name)
+        warning = StringIO()
+        # Nodes and directives registered by a build must not leak into the next one
+        with docutils_namespace():
+            app = Sphinx(self.srcdir, self.srcdir, outdir, os.path.join(self.directory, name + '-doctrees'),
+                         builder, confoverrides=confoverrides, status=None, warning=warning, freshenv=freshenv,
+                         parallel=parallel)
+            if setup is not None:
+                setup(app)
+            app.build()
+        return warning.getvalue()
+
+    def read(self, path, name='html'):
+        """Return the raw contents of a built file."""
+        with open(os.path.join(self.directory, name, *path.split('/')), 'rb') as fd:
+            return fd.read()
+
+    def outputs(self, name='html', suffix='.html'):
+        """Return the paths, relative to the output directory, of the built files ending with ``suffix``."""
+        outdir = os.path.join(self.directory, name)
+        found = []
+        for root, dirnames, filenames in os.walk(outdir):
+            for filename in filenames:
+                if filename.endswith(suffix):
+                    found.append(os.path.relpath(os.path.join(root, filename), outdir).replace(os.sep, '/'))
+        return sorted(found)
+
+    def cleanup(self):
+        shutil.rmtree(self.directory, ignore_errors=True)